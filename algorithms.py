@@ -33,6 +33,44 @@ index = binary_search(sample_array, target_value)
 print(f"Index of the target ({target_value}):", index)
 
 
+# Batch Binary Search
+# Implementation: numpy.searchsorted runs the binary search for a whole array of targets in C. With side="left" or
+# side="right" it returns insertion points: the first position whose value is >= target (left) or > target (right).
+# A pair of them gives the range of equal values, so the same call answers range queries.
+
+import numpy as np
+
+
+def binary_search_batch(arr, targets, side=None):
+    """Positions of all targets in sorted arr (-1 where missing), or their insertion points when side is given
+
+    A single target gives a single position instead of an array.
+    """
+    arr = np.asarray(arr)
+    targets = np.asarray(targets)
+    if side is not None:
+        return np.searchsorted(arr, targets, side=side)
+
+    # Boolean mask indexing below needs at least one dimension
+    batch = np.atleast_1d(targets)
+    positions = np.searchsorted(arr, batch, side='left')
+    found = positions < len(arr)
+    found[found] = arr[positions[found]] == batch[found]
+    positions = np.where(found, positions, -1)
+    return positions[0] if targets.ndim == 0 else positions
+
+
+def range_query(arr, lows, highs):
+    """(start, end) index arrays such that arr[start:end] holds the values in [low, high] for every pair"""
+    return binary_search_batch(arr, lows, side='left'), binary_search_batch(arr, highs, side='right')
+
+
+print("Indexes of the targets:", binary_search_batch(sample_array, [9, 10, 21]))  # Expected: [ 4 -1 10]
+print("Index of a single target:", binary_search_batch(sample_array, 9))  # Expected: 4
+starts, ends = range_query(sample_array, [4, 10], [9, 15])
+print("Values in [4, 9] and [10, 15]:", [sample_array[s:e] for s, e in zip(starts, ends)])
+
+
 # Merge Sort Algorithm
 # Implementation: Merge sort is a divide and conquer algorithm that divides the input array into two halves,
 # calls itself for the two halves, and then merges the two sorted halves.
@@ -77,6 +115,84 @@ merge_sort(sample_array)
 print("Sorted array:", sample_array)
 
 
+# Iterative (bottom-up) Merge Sort
+# Implementation: instead of slicing the array in halves recursively, the array is cut into small runs that are sorted
+# with insertion sort, then runs of width 32, 64, 128, ... are merged pairwise. Merging goes from the array into one
+# auxiliary buffer and back (ping-pong), so no temporary lists are created per level and there is no recursion.
+# With key= the keys are computed once and moved together with the items. Equal keys keep their order (stable).
+
+def _insertion_sort_run(keys, values, lo, hi):
+    for i in range(lo + 1, hi):
+        current_key = keys[i]
+        current_value = values[i] if values is not None else None
+        j = i - 1
+        while j >= lo and current_key < keys[j]:
+            keys[j + 1] = keys[j]
+            if values is not None:
+                values[j + 1] = values[j]
+            j -= 1
+        keys[j + 1] = current_key
+        if values is not None:
+            values[j + 1] = current_value
+
+
+def _merge_runs(src_keys, src_values, dst_keys, dst_values, lo, mid, hi):
+    i, j = lo, mid
+    for k in range(lo, hi):
+        # Take from the right run only if strictly smaller, this keeps the sort stable
+        if j < hi and (i >= mid or src_keys[j] < src_keys[i]):
+            dst_keys[k] = src_keys[j]
+            if dst_values is not None:
+                dst_values[k] = src_values[j]
+            j += 1
+        else:
+            dst_keys[k] = src_keys[i]
+            if dst_values is not None:
+                dst_values[k] = src_values[i]
+            i += 1
+
+
+def merge_sort_iterative(arr, key=None, run_size=32):
+    n = len(arr)
+    if n < 2:
+        return
+    if key is None:
+        keys, values = arr, None
+    else:
+        keys, values = [key(x) for x in arr], arr
+
+    for lo in range(0, n, run_size):
+        _insertion_sort_run(keys, values, lo, min(lo + run_size, n))
+
+    src_keys, src_values = keys, values
+    dst_keys = [None] * n
+    dst_values = [None] * n if values is not None else None
+    width = run_size
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            _merge_runs(src_keys, src_values, dst_keys, dst_values, lo, mid, hi)
+        src_keys, dst_keys = dst_keys, src_keys
+        src_values, dst_values = dst_values, src_values
+        width *= 2
+
+    # After an odd number of passes the result sits in the buffer
+    if src_keys is not keys:
+        keys[:] = src_keys
+        if values is not None:
+            values[:] = src_values
+
+
+sample_array = [38, 27, 43, 3, 9, 82, 10]
+merge_sort_iterative(sample_array)
+print("Sorted array:", sample_array)
+
+sample_pairs = [("b", 2), ("a", 1), ("c", 2), ("d", 1)]
+merge_sort_iterative(sample_pairs, key=lambda pair: pair[1])
+print("Sorted by value, stable:", sample_pairs)  # Expected: [('a', 1), ('d', 1), ('b', 2), ('c', 2)]
+
+
 # Quick Sort Algorithm
 # Implementation: QuickSort is a divide and conquer algorithm.
 # It picks an element as a pivot and partitions the given array around the picked pivot.
@@ -101,6 +217,101 @@ sorted_array = quick_sort(sample_array)
 print("Sorted array:", sorted_array)
 
 
+# Introsort (in-place Quick Sort)
+# Implementation: the array is partitioned in place around a median-of-three pivot (ninther, the median of three
+# medians, for large ranges) into three parts: smaller than, equal to and greater than the pivot, so duplicate-heavy
+# data is handled in one pass. The smaller part is sorted recursively and the larger one in the loop, which bounds the
+# stack depth by log n. If partitioning goes deeper than 2*log n levels the range falls back to heapsort, so the worst
+# case stays O(n log n). Small ranges are finished with insertion sort.
+
+def _sift_down(arr, lo, root, end):
+    while True:
+        child = 2 * root + 1
+        if child >= end:
+            return
+        if child + 1 < end and arr[lo + child] < arr[lo + child + 1]:
+            child += 1
+        if not arr[lo + root] < arr[lo + child]:
+            return
+        arr[lo + root], arr[lo + child] = arr[lo + child], arr[lo + root]
+        root = child
+
+
+def _heap_sort_range(arr, lo, hi):
+    n = hi - lo
+    for start in range(n // 2 - 1, -1, -1):
+        _sift_down(arr, lo, start, n)
+    for end in range(n - 1, 0, -1):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        _sift_down(arr, lo, 0, end)
+
+
+def _median_of_three(arr, a, b, c):
+    if arr[a] < arr[b]:
+        if arr[b] < arr[c]:
+            return b
+        return c if arr[a] < arr[c] else a
+    if arr[a] < arr[c]:
+        return a
+    return c if arr[b] < arr[c] else b
+
+
+def _intro_sort(arr, lo, hi, depth):
+    while hi - lo > 16:
+        if depth == 0:
+            _heap_sort_range(arr, lo, hi)
+            return
+        depth -= 1
+
+        mid = (lo + hi) // 2
+        if hi - lo > 128:
+            step = (hi - lo) // 8
+            pivot_index = _median_of_three(arr,
+                                           _median_of_three(arr, lo, lo + step, lo + 2 * step),
+                                           _median_of_three(arr, mid - step, mid, mid + step),
+                                           _median_of_three(arr, hi - 1 - 2 * step, hi - 1 - step, hi - 1))
+        else:
+            pivot_index = _median_of_three(arr, lo, mid, hi - 1)
+        pivot = arr[pivot_index]
+
+        # [lo, lt) < pivot, [lt, i) == pivot, (gt, hi) > pivot
+        lt, i, gt = lo, lo, hi - 1
+        while i <= gt:
+            x = arr[i]
+            if x < pivot:
+                arr[lt], arr[i] = x, arr[lt]
+                lt += 1
+                i += 1
+            elif pivot < x:
+                arr[i], arr[gt] = arr[gt], x
+                gt -= 1
+            else:
+                i += 1
+
+        if lt - lo < hi - gt - 1:
+            _intro_sort(arr, lo, lt, depth)
+            lo = gt + 1
+        else:
+            _intro_sort(arr, gt + 1, hi, depth)
+            hi = lt
+    _insertion_sort_run(arr, None, lo, hi)
+
+
+def intro_sort(arr):
+    if len(arr) > 1:
+        _intro_sort(arr, 0, len(arr), 2 * len(arr).bit_length())
+
+
+sample_array = [21, 4, 1, 3, 9, 20, 25]
+intro_sort(sample_array)
+print("Sorted array:", sample_array)
+
+# Sorted and all-equal inputs are the bad cases of a naive quick sort
+sample_array = list(range(100_000)) + [7] * 100_000
+intro_sort(sample_array)
+print("Sorted 200k adversarial elements:", sample_array == sorted(sample_array))
+
+
 # Depth-First Search (DFS) Algorithm
 # Implementation: DFS is an algorithm for traversing or searching tree or graph data structures.
 # One starts at the root and explores as far as possible along each branch before backtracking.
@@ -130,3 +341,440 @@ sample_graph = {
 # DFS function call starting from node 'A'
 visited_nodes = dfs(sample_graph, 'A')
 print("Visited nodes in DFS order:", visited_nodes)
+
+
+# Graph traversal on a CSR (compressed sparse row) layout
+# Implementation: the dict-of-lists graph is compiled once. Nodes are numbered 0..n-1, the neighbours of all nodes are
+# stored back to back in one flat array (targets) and offsets[i]:offsets[i + 1] is the slice belonging to node i.
+# Visited flags live in a bytearray with one byte per node instead of a set of labels. All traversals are iterative
+# (an explicit stack or queue instead of recursion), so deep graphs do not hit the recursion limit, and they are
+# generators that leave any output to the caller.
+
+from array import array
+from collections import deque
+
+
+class CSRGraph:
+    def __init__(self, graph):
+        nodes = list(graph)
+        index = {node: i for i, node in enumerate(nodes)}
+        # Nodes that only appear as neighbours get numbers too
+        for neighbours in graph.values():
+            for node in neighbours:
+                if node not in index:
+                    index[node] = len(nodes)
+                    nodes.append(node)
+        self.nodes = nodes
+        self.index = index
+
+        offsets = array('q', [0])
+        targets = array('q')
+        for node in nodes:
+            targets.extend([index[neighbour] for neighbour in graph.get(node, ())])
+            offsets.append(len(targets))
+        self.offsets = offsets
+        self.targets = targets
+        self._reverse = None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def dfs(self, start):
+        """Nodes reachable from start in depth-first (preorder) order, same order as the recursive dfs"""
+        offsets, targets, nodes = self.offsets, self.targets, self.nodes
+        visited = bytearray(len(nodes))
+        # Position of the next neighbour to look at, per node
+        cursor = offsets[:-1]
+        root = self.index[start]
+        visited[root] = 1
+        yield start
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            position = cursor[node]
+            if position < offsets[node + 1]:
+                cursor[node] = position + 1
+                neighbour = targets[position]
+                if not visited[neighbour]:
+                    visited[neighbour] = 1
+                    yield nodes[neighbour]
+                    stack.append(neighbour)
+            else:
+                stack.pop()
+
+    def bfs(self, start):
+        """Nodes reachable from start in breadth-first order"""
+        offsets, targets, nodes = self.offsets, self.targets, self.nodes
+        visited = bytearray(len(nodes))
+        root = self.index[start]
+        visited[root] = 1
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            yield nodes[node]
+            for position in range(offsets[node], offsets[node + 1]):
+                neighbour = targets[position]
+                if not visited[neighbour]:
+                    visited[neighbour] = 1
+                    queue.append(neighbour)
+
+    def topological_sort(self):
+        """Nodes so that every edge points forward (Kahn's algorithm), raises ValueError if the graph has a cycle"""
+        offsets, targets, nodes = self.offsets, self.targets, self.nodes
+        in_degree = array('q', bytes(8 * len(nodes)))
+        for target in targets:
+            in_degree[target] += 1
+        queue = deque(i for i, degree in enumerate(in_degree) if degree == 0)
+        emitted = 0
+        while queue:
+            node = queue.popleft()
+            emitted += 1
+            yield nodes[node]
+            for position in range(offsets[node], offsets[node + 1]):
+                neighbour = targets[position]
+                in_degree[neighbour] -= 1
+                if not in_degree[neighbour]:
+                    queue.append(neighbour)
+        if emitted != len(nodes):
+            raise ValueError("Graph has a cycle, no topological order exists")
+
+    def _reversed_edges(self):
+        """CSR arrays of the graph with every edge reversed, built on first use"""
+        if self._reverse is None:
+            n = len(self.nodes)
+            counts = array('q', bytes(8 * (n + 1)))
+            for target in self.targets:
+                counts[target + 1] += 1
+            for i in range(n):
+                counts[i + 1] += counts[i]
+            fill = counts[:-1]
+            sources = array('q', bytes(8 * len(self.targets)))
+            offsets, targets = self.offsets, self.targets
+            for node in range(n):
+                for position in range(offsets[node], offsets[node + 1]):
+                    target = targets[position]
+                    sources[fill[target]] = node
+                    fill[target] += 1
+            self._reverse = (counts, sources)
+        return self._reverse
+
+    def connected_components(self):
+        """Lists of nodes that are connected when edge direction is ignored (weakly connected components)"""
+        offsets, targets, nodes = self.offsets, self.targets, self.nodes
+        reverse_offsets, sources = self._reversed_edges()
+        visited = bytearray(len(nodes))
+        for root in range(len(nodes)):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            component = []
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                component.append(nodes[node])
+                for edges, begin, end in ((targets, offsets[node], offsets[node + 1]),
+                                          (sources, reverse_offsets[node], reverse_offsets[node + 1])):
+                    for position in range(begin, end):
+                        neighbour = edges[position]
+                        if not visited[neighbour]:
+                            visited[neighbour] = 1
+                            stack.append(neighbour)
+            yield component
+
+
+csr_graph = CSRGraph(sample_graph)
+print("DFS:", list(csr_graph.dfs('A')))  # Expected: ['A', 'B', 'D', 'E', 'F', 'C']
+print("BFS:", list(csr_graph.bfs('A')))  # Expected: ['A', 'B', 'C', 'D', 'E', 'F']
+print("Topological order:", list(csr_graph.topological_sort()))
+print("Components:", list(CSRGraph({1: [2], 3: [2], 4: []}).connected_components()))  # Expected: [[1, 2, 3], [4]]
+
+
+# Reachability index and shortest paths
+# Implementation: nodes that reach each other (strongly connected components, found with an iterative Tarjan's
+# algorithm) are collapsed into one component, which turns the graph into a DAG. Every component gets a bitset (a
+# Python int) of the components it can reach, filled in from the sinks upwards, so "is B reachable from A" is a single
+# bit test. Adding an edge u -> v ORs the bitset of v into every component that reaches u; an edge that closes a cycle
+# merges components, which rebuilds the index on the next query. Shortest paths use BFS for unweighted graphs and
+# Dijkstra with one heap list that is reused between queries; targets that cannot be reached are rejected up front.
+
+import heapq
+
+
+class ReachabilityIndex:
+    def __init__(self, graph):
+        self.graph = {node: list(neighbours) for node, neighbours in graph.items()}
+        for neighbours in graph.values():
+            for node in neighbours:
+                self.graph.setdefault(node, [])
+        self._heap = []
+        self._build()
+
+    def _build(self):
+        """Find strongly connected components and the bitset of components reachable from each one"""
+        graph = self.graph
+        order = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        component = {}
+        members = []
+        counter = 0
+        for root in graph:
+            if root in order:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph[root]))]
+            while work:
+                node, neighbours = work[-1]
+                for neighbour in neighbours:
+                    if neighbour not in order:
+                        order[neighbour] = low[neighbour] = counter
+                        counter += 1
+                        stack.append(neighbour)
+                        on_stack.add(neighbour)
+                        work.append((neighbour, iter(graph[neighbour])))
+                        break
+                    if neighbour in on_stack:
+                        low[node] = min(low[node], order[neighbour])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == order[node]:
+                        # node is the root of a component, Tarjan finds components sinks first
+                        group = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component[member] = len(members)
+                            group.append(member)
+                            if member == node:
+                                break
+                        members.append(group)
+
+        reach = []
+        for c, group in enumerate(members):
+            bits = 1 << c
+            for node in group:
+                for neighbour in graph[node]:
+                    bits |= reach[component[neighbour]] if component[neighbour] != c else 0
+            reach.append(bits)
+        self._component = component
+        self._reach = reach
+        self._dirty = False
+
+    def reachable(self, source, target):
+        """True if there is a path from source to target"""
+        if self._dirty:
+            self._build()
+        return (self._reach[self._component[source]] >> self._component[target]) & 1 == 1
+
+    def add_edge(self, source, target):
+        """Add an edge and update the reachability bitsets"""
+        for node in (source, target):
+            if node not in self.graph:
+                self.graph[node] = []
+                if not self._dirty:
+                    self._component[node] = len(self._reach)
+                    self._reach.append(1 << len(self._reach))
+        self.graph[source].append(target)
+        if self._dirty or self.reachable(source, target):
+            return
+        if self.reachable(target, source):
+            # The edge closes a cycle and merges components, rebuild lazily
+            self._dirty = True
+            return
+        source_bit = 1 << self._component[source]
+        target_reach = self._reach[self._component[target]]
+        reach = self._reach
+        for c in range(len(reach)):
+            if reach[c] & source_bit:
+                reach[c] |= target_reach
+
+    def shortest_paths(self, sources, weight=None):
+        """Distance from the nearest of the sources to every reachable node, weight(u, v) gives edge lengths"""
+        graph = self.graph
+        distances = {source: 0 for source in sources}
+        if weight is None:
+            queue = deque(distances)
+            while queue:
+                node = queue.popleft()
+                for neighbour in graph[node]:
+                    if neighbour not in distances:
+                        distances[neighbour] = distances[node] + 1
+                        queue.append(neighbour)
+            return distances
+
+        heap = self._heap
+        heap.clear()
+        # The counter breaks ties so that nodes themselves are never compared
+        counter = 0
+        for source in distances:
+            heap.append((0, counter, source))
+            counter += 1
+        done = set()
+        while heap:
+            distance, _, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            for neighbour in graph[node]:
+                candidate = distance + weight(node, neighbour)
+                if candidate < distances.get(neighbour, float('inf')):
+                    distances[neighbour] = candidate
+                    heapq.heappush(heap, (candidate, counter, neighbour))
+                    counter += 1
+        return distances
+
+    def shortest_path(self, source, target, weight=None):
+        """List of nodes on a shortest path from source to target, None if target is not reachable"""
+        if not self.reachable(source, target):
+            return None
+        graph = self.graph
+        parent = {source: None}
+        if weight is None:
+            queue = deque([source])
+            while queue and target not in parent:
+                node = queue.popleft()
+                for neighbour in graph[node]:
+                    if neighbour not in parent:
+                        parent[neighbour] = node
+                        queue.append(neighbour)
+        else:
+            heap = self._heap
+            heap.clear()
+            heap.append((0, 0, source))
+            counter = 1
+            distances = {source: 0}
+            done = set()
+            while heap:
+                distance, _, node = heapq.heappop(heap)
+                if node == target:
+                    break
+                if node in done:
+                    continue
+                done.add(node)
+                for neighbour in graph[node]:
+                    candidate = distance + weight(node, neighbour)
+                    if candidate < distances.get(neighbour, float('inf')):
+                        distances[neighbour] = candidate
+                        parent[neighbour] = node
+                        heapq.heappush(heap, (candidate, counter, neighbour))
+                        counter += 1
+
+        path = [target]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        return path[::-1]
+
+
+reachability = ReachabilityIndex(sample_graph)
+print("F reachable from A:", reachability.reachable('A', 'F'))  # Expected: True
+print("A reachable from F:", reachability.reachable('F', 'A'))  # Expected: False
+reachability.add_edge('F', 'A')
+print("A reachable from F after adding F -> A:", reachability.reachable('F', 'A'))  # Expected: True
+print("Shortest path A -> F:", reachability.shortest_path('A', 'F'))  # Expected: ['A', 'C', 'F']
+
+
+# Benchmark of the sorts against the built-in sorted()
+
+import random
+import time
+
+
+def benchmark_sorts(sizes=(1_000, 10_000, 100_000, 1_000_000)):
+    # Pass sizes up to 10_000_000 for the full run, the pure Python sorts take minutes there
+    for n in sizes:
+        data = [random.random() for _ in range(n)]
+        for name, sort in (("merge_sort", merge_sort),
+                           ("merge_sort_iterative", merge_sort_iterative),
+                           ("quick_sort", lambda arr: arr.__setitem__(slice(None), quick_sort(arr))),
+                           ("intro_sort", intro_sort),
+                           ("sorted", lambda arr: arr.sort())):
+            arr = list(data)
+            start = time.perf_counter()
+            sort(arr)
+            elapsed = time.perf_counter() - start
+            assert arr == sorted(data)
+            print(f"{name:>22} n={n:>9}: {elapsed:.4f}s")
+
+
+def benchmark_binary_search(n=1_000_000, queries=1_000_000):
+    index = np.unique(np.random.randint(0, n * 4, size=n))
+    targets = np.random.randint(0, n * 4, size=queries)
+    index_list, target_list = index.tolist(), targets.tolist()
+
+    start = time.perf_counter()
+    scalar = [binary_search(index_list, target) for target in target_list]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = binary_search_batch(index, targets)
+    batch_time = time.perf_counter() - start
+
+    assert [-1 if position is None else position for position in scalar] == batch.tolist()
+    print(f"{queries} lookups in {len(index)} keys: binary_search loop {scalar_time:.3f}s, "
+          f"binary_search_batch {batch_time:.3f}s")
+
+
+import contextlib
+import io
+
+
+def benchmark_graph(n=300_000, edges_per_node=4):
+    graph = {i: random.sample(range(n), edges_per_node) for i in range(n)}
+    start = time.perf_counter()
+    compiled = CSRGraph(graph)
+    build_time = time.perf_counter() - start
+    for name, traversal in (("dfs", compiled.dfs), ("bfs", compiled.bfs)):
+        start = time.perf_counter()
+        visited = sum(1 for _ in traversal(0))
+        print(f"CSRGraph.{name}: {visited} nodes in {time.perf_counter() - start:.3f}s (build {build_time:.3f}s)")
+
+    # A long dependency chain is where the recursive dfs gives up
+    chain = {i: [i + 1] for i in range(n)}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            dfs(chain, 0)
+    except RecursionError:
+        print(f"dfs on a {n} node chain: RecursionError")
+    print(f"CSRGraph.dfs on a {n} node chain: {sum(1 for _ in CSRGraph(chain).dfs(0))} nodes")
+
+
+def benchmark_reachability(n=20_000, edges_per_node=2, queries=100_000):
+    # Edges only point to higher numbers, a mostly static DAG like a dependency graph
+    graph = {i: [random.randrange(i + 1, n) for _ in range(edges_per_node)] if i < n - 1 else [] for i in range(n)}
+    pairs = [(random.randrange(n), random.randrange(n)) for _ in range(queries)]
+
+    start = time.perf_counter()
+    index = ReachabilityIndex(graph)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    answers = [index.reachable(a, b) for a, b in pairs]
+    query_time = time.perf_counter() - start
+
+    compiled = CSRGraph(graph)
+    start = time.perf_counter()
+    for (a, b), answer in zip(pairs[:100], answers):
+        assert (b in compiled.bfs(a)) == answer
+    bfs_time = (time.perf_counter() - start) / 100 * queries
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        index.add_edge(random.randrange(n), random.randrange(n))
+    add_time = time.perf_counter() - start
+    print(f"ReachabilityIndex: build {build_time:.2f}s, {queries} queries {query_time:.3f}s "
+          f"(BFS per query would take ~{bfs_time:.1f}s), 1000 add_edge {add_time:.2f}s")
+
+
+# The benchmarks take minutes, they only run when the module is executed directly
+if __name__ == '__main__':
+    benchmark_sorts()
+    benchmark_binary_search()
+    benchmark_graph()
+    benchmark_reachability()
@@ -0,0 +1,137 @@
+"""
+
+Columnar log storage
+
+Every reader of the text log (generators.log_entries_gen, iterators.LogFileIterator, context_manager.FileOpener) splits
+and converts every line again on every run, even when a query needs one column of one day. A columnar file does the
+parsing once:
+
+1. **Conversion**: convert_log_to_parquet parses the text log with the pyarrow CSV reader (space separated, streamed in
+   blocks) into typed columns: date as date32, time as time32, user_id as int16 and action dictionary encoded. The
+   columns are written to a zstd compressed Parquet file in row groups of row_group_size rows.
+2. **Column pruning**: every column of a row group is stored separately, so a reader asks only for the columns it
+   needs. Counting logins per day reads date and action and never touches time or user_id.
+3. **Predicate pushdown**: Parquet keeps min/max statistics per column per row group in the file footer. A query for
+   one date reads the footer first and skips every row group whose [min, max] date range does not contain it. The log
+   is written in time order, so the date ranges of the row groups hardly overlap and a one-day query reads only the
+   few row groups of that day.
+
+"""
+
+import datetime
+import os
+import time
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as csv
+import pyarrow.parquet as pq
+
+LOG_COLUMN_TYPES = {
+    'date': pa.date32(),
+    'time': pa.time32('s'),
+    'user_id': pa.int16(),
+    # The CSV reader only builds dictionaries with int32 indices
+    'action': pa.dictionary(pa.int32(), pa.string()),
+}
+
+
+def convert_log_to_parquet(text_path, parquet_path, row_group_size=128 * 1024, block_bytes=16 * 1024 ** 2,
+                           compression='zstd'):
+    """Write the text log as a Parquet file, returns the number of rows"""
+    reader = csv.open_csv(
+        text_path,
+        read_options=csv.ReadOptions(column_names=list(LOG_COLUMN_TYPES), block_size=block_bytes),
+        parse_options=csv.ParseOptions(delimiter=' '),
+        convert_options=csv.ConvertOptions(column_types=LOG_COLUMN_TYPES),
+    )
+    rows = 0
+    with pq.ParquetWriter(parquet_path, reader.schema, compression=compression) as writer:
+        for batch in reader:
+            writer.write_table(pa.Table.from_batches([batch]), row_group_size=row_group_size)
+            rows += batch.num_rows
+    return rows
+
+
+def matching_row_groups(parquet_file, column, low, high=None):
+    """Indices of the row groups whose min/max statistics of column overlap [low, high]"""
+    high = low if high is None else high
+    index = parquet_file.schema_arrow.get_field_index(column)
+    groups = []
+    for group in range(parquet_file.num_row_groups):
+        statistics = parquet_file.metadata.row_group(group).column(index).statistics
+        # Without statistics nothing is known about the row group, so it has to be read
+        if statistics is None or not statistics.has_min_max or (statistics.min <= high and low <= statistics.max):
+            groups.append(group)
+    return groups
+
+
+def count_logins_on(parquet_path, date):
+    """LOGIN count of one day ('YYYY-MM-DD'), reads only the date and action columns of the row groups of that day"""
+    date = datetime.date.fromisoformat(date)
+    parquet_file = pq.ParquetFile(parquet_path)
+    groups = matching_row_groups(parquet_file, 'date', date)
+    table = parquet_file.read_row_groups(groups, columns=['date', 'action'])
+    return table.filter((pc.field('date') == date) & (pc.field('action') == 'LOGIN')).num_rows
+
+
+def count_login_per_day_columnar(parquet_path):
+    """Same result as count_login_per_day, from the date and action columns only"""
+    # filters= is the same pushdown done by pyarrow itself: row groups are skipped by statistics, rows are filtered
+    table = pq.read_table(parquet_path, columns=['date'], filters=[('action', '=', 'LOGIN')])
+    counts = pc.value_counts(table['date'])
+    return {date.isoformat(): count for date, count in
+            sorted(zip(counts.field('values').to_pylist(), counts.field('counts').to_pylist()))}
+
+
+def _count_logins_text(filename, date=None):
+    """Baseline: split every line of the text log, like the text based readers"""
+    login_counts = {}
+    with open(filename) as f:
+        for line in f:
+            parts = line.split()
+            if parts[3] == 'LOGIN' and (date is None or parts[0] == date):
+                login_counts[parts[0]] = login_counts.get(parts[0], 0) + 1
+    return login_counts
+
+
+def benchmark_columnar(text_path="benchmark_columnar.log", num_entries=5_000_000, date='2024-01-05'):
+    from log_file import generate_log_file_fast
+
+    generate_log_file_fast(text_path, num_entries, seed=7)
+    parquet_path = text_path + '.parquet'
+
+    start = time.perf_counter()
+    convert_log_to_parquet(text_path, parquet_path)
+    print(f"Conversion: {time.perf_counter() - start:.2f}s, "
+          f"text {os.path.getsize(text_path) / 1024 ** 2:.0f} MiB -> "
+          f"parquet {os.path.getsize(parquet_path) / 1024 ** 2:.0f} MiB")
+
+    start = time.perf_counter()
+    expected = dict(sorted(_count_logins_text(text_path).items()))
+    text_all = time.perf_counter() - start
+    start = time.perf_counter()
+    assert count_login_per_day_columnar(parquet_path) == expected
+    columnar_all = time.perf_counter() - start
+    print(f"Logins per day: text {text_all:.2f}s, columnar {columnar_all:.3f}s")
+
+    start = time.perf_counter()
+    expected = _count_logins_text(text_path, date)[date]
+    text_day = time.perf_counter() - start
+    start = time.perf_counter()
+    assert count_logins_on(parquet_path, date) == expected
+    columnar_day = time.perf_counter() - start
+    parquet_file = pq.ParquetFile(parquet_path)
+    print(f"Logins on {date}: text {text_day:.2f}s, columnar {columnar_day:.3f}s, read "
+          f"{len(matching_row_groups(parquet_file, 'date', datetime.date.fromisoformat(date)))} of "
+          f"{parquet_file.num_row_groups} row groups")
+
+    os.remove(text_path)
+    os.remove(parquet_path)
+
+
+if __name__ == '__main__':
+    convert_log_to_parquet("large_log_file.log", "large_log_file.parquet")
+    for date, count in count_login_per_day_columnar("large_log_file.parquet").items():
+        print(f"On {date}, there were {count} logins.")
+    benchmark_columnar()
@@ -0,0 +1,167 @@
+"""
+
+External Merge Sort
+
+The sorts in algorithms.py need the whole list in memory. When the data is larger than RAM (for example the log files
+written by log_file.generate_log_file) it has to be sorted in pieces:
+
+1. **Run generation**: the file is cut into chunks that fit the memory budget. Chunk borders are moved to the next
+   newline so no line is split. Every chunk is read, sorted and written to a temporary "run" file by a worker process,
+   so several chunks are sorted in parallel on different CPU cores.
+2. **K-way merge**: all runs are merged into the output with a heap (heapq.merge) which keeps only the current line of
+   every run in memory. If there are more runs than can be opened at once, groups of runs are merged into bigger runs
+   first (multi-pass merge).
+
+Lines are handled as bytes, nothing is decoded. Memory use is bounded by the number of workers times the chunk size:
+at most `workers` chunks are in flight at any time and the chunk size is derived from `memory_budget`.
+
+"""
+
+import heapq
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# A sorted chunk needs several times its size in RAM: the raw bytes, one bytes object per line and the list holding them
+_MEMORY_PER_CHUNK_BYTE = 4
+
+
+def log_timestamp(line):
+    """Sort key of a log line: the "YYYY-MM-DD HH:MM:SS" prefix, which sorts correctly as bytes"""
+    return line[:19]
+
+
+def chunk_boundaries(path, chunk_bytes):
+    """Yield (start, end) byte ranges of about chunk_bytes that end right after a newline"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            yield start, end
+            start = end
+
+
+def _sort_run(input_path, start, end, run_path, key):
+    """Worker: sort the lines of input_path[start:end] and write them to run_path"""
+    with open(input_path, 'rb') as f:
+        f.seek(start)
+        lines = f.read(end - start).splitlines(keepends=True)
+    if lines and not lines[-1].endswith(b'\n'):
+        lines[-1] += b'\n'
+    lines.sort(key=key)
+    with open(run_path, 'wb') as f:
+        f.writelines(lines)
+    return run_path
+
+
+def _merge_runs(run_paths, output_path, key):
+    """Heap-merge sorted run files into output_path and delete the runs"""
+    files = [open(path, 'rb', buffering=1 << 16) for path in run_paths]
+    try:
+        with open(output_path, 'wb', buffering=1 << 20) as out:
+            out.writelines(heapq.merge(*files, key=key))
+    finally:
+        for f in files:
+            f.close()
+    for path in run_paths:
+        os.remove(path)
+    return output_path
+
+
+def external_sort(input_path, output_path, key=log_timestamp, memory_budget=256 * 1024 ** 2, workers=None,
+                  max_fan_in=64, tmp_dir=None):
+    workers = workers or os.cpu_count() or 1
+    chunk_bytes = max(1024 ** 2, memory_budget // (workers * _MEMORY_PER_CHUNK_BYTE))
+    tmp_dir = tempfile.mkdtemp(prefix='external_sort_', dir=tmp_dir)
+    runs = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for number, (start, end) in enumerate(chunk_boundaries(input_path, chunk_bytes)):
+            # Never keep more chunks in flight than there are workers, this is what caps memory use
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            # Runs are kept in chunk order, not completion order: heapq.merge and the group merges are stable, so
+            # lines with equal keys come out in input order on every run
+            runs.append(os.path.join(tmp_dir, f"run_{number}"))
+            pending.add(pool.submit(_sort_run, input_path, start, end, runs[-1], key))
+        for future in wait(pending).done:
+            future.result()
+
+        # Merge groups of runs in parallel until a single final merge can open all of them
+        level = 0
+        while len(runs) > max_fan_in:
+            groups = [runs[i:i + max_fan_in] for i in range(0, len(runs), max_fan_in)]
+            futures = [pool.submit(_merge_runs, group, os.path.join(tmp_dir, f"merge_{level}_{i}"), key)
+                       for i, group in enumerate(groups)]
+            runs = [future.result() for future in futures]
+            level += 1
+
+    _merge_runs(runs, output_path, key)
+    os.rmdir(tmp_dir)
+    return output_path
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process and of its (finished) worker processes, None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return own, children
+
+
+def _write_shuffled_log(filename, num_entries):
+    """Log file in the log_file.generate_log_file format but with random timestamps, so it actually needs sorting"""
+    actions = ["LOGIN", "LOGOUT", "ERROR", "INFO"]
+    start = time.mktime((2024, 1, 1, 0, 0, 0, 0, 0, -1))
+    with open(filename, 'w') as f:
+        batch = []
+        for _ in range(num_entries):
+            date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start + random.randrange(30 * 86400)))
+            batch.append(f"{date} {random.randint(1000, 9999)} {random.choice(actions)}\n")
+            if len(batch) == 100_000:
+                f.writelines(batch)
+                batch = []
+        f.writelines(batch)
+
+
+def benchmark_external_sort(num_entries=2_000_000, memory_budget=64 * 1024 ** 2, workers=4):
+    # Raise num_entries to ~100_000_000 for a multi-GB file, memory_budget keeps RSS flat regardless of file size
+    input_path, output_path = "unsorted_log_file.log", "sorted_log_file.log"
+    _write_shuffled_log(input_path, num_entries)
+    size_mb = os.path.getsize(input_path) / 1024 ** 2
+
+    start = time.perf_counter()
+    external_sort(input_path, output_path, memory_budget=memory_budget, workers=workers)
+    elapsed = time.perf_counter() - start
+
+    previous = b''
+    with open(output_path, 'rb') as f:
+        for count, line in enumerate(f, 1):
+            assert previous <= line[:19]
+            previous = line[:19]
+    assert count == num_entries
+
+    print(f"Sorted {size_mb:.0f} MiB ({num_entries} lines) in {elapsed:.2f}s with {workers} workers, "
+          f"memory budget {memory_budget / 1024 ** 2:.0f} MiB")
+    rss = _peak_rss_mb()
+    if rss is not None:
+        print(f"Peak RSS: main process {rss[0]:.0f} MiB, largest worker {rss[1]:.0f} MiB")
+    os.remove(input_path)
+    os.remove(output_path)
+
+
+# Worker processes may re-import this module (spawn start method), the benchmark must only run in the parent
+if __name__ == '__main__':
+    benchmark_external_sort()
@@ -128,3 +128,504 @@ Line #    Mem usage    Increment  Occurrences   Line Contents
 Time taken: 48.37473201751709 seconds
 
 """
+
+
+"""
+
+Streaming log analytics
+
+count_login_per_day answers one question per pass over the file. LogQuery describes a report declaratively: which
+fields to group by (date, hour, user_id, action), what to compute for every group (Count, DistinctCount, FirstSeen,
+LastSeen) and which lines to keep (where). run_log_queries() reads the line stream from log_entries_gen once, splits
+every line once and feeds it to all queries, so any number of reports cost a single pass over a multi-GB file.
+
+Line format (as written by log_file.generate_log_file): "2024-01-05 13:45:10 1234 LOGIN"
+
+"""
+
+LOG_FIELDS = {
+    'date': lambda parts: parts[0],
+    'time': lambda parts: parts[1],
+    'hour': lambda parts: parts[1][:2],
+    'user_id': lambda parts: parts[2],
+    'action': lambda parts: parts[3],
+}
+
+
+class Count:
+    def initial(self):
+        return 0
+
+    def update(self, state, parts):
+        return state + 1
+
+    def result(self, state):
+        return state
+
+
+class DistinctCount:
+    def __init__(self, field):
+        self.field = LOG_FIELDS[field]
+
+    def initial(self):
+        return set()
+
+    def update(self, state, parts):
+        state.add(self.field(parts))
+        return state
+
+    def result(self, state):
+        return len(state)
+
+
+class FirstSeen:
+    """Earliest "date time" timestamp of the group"""
+
+    def initial(self):
+        return None
+
+    def update(self, state, parts):
+        timestamp = f"{parts[0]} {parts[1]}"
+        return timestamp if state is None or timestamp < state else state
+
+    def result(self, state):
+        return state
+
+
+class LastSeen(FirstSeen):
+    """Latest "date time" timestamp of the group"""
+
+    def update(self, state, parts):
+        timestamp = f"{parts[0]} {parts[1]}"
+        return timestamp if state is None or timestamp > state else state
+
+
+class LogQuery:
+    def __init__(self, group_by=(), aggregates=None, where=None):
+        """
+        group_by   - field names, e.g. ('date',) or ('date', 'hour')
+        aggregates - result name -> aggregate, e.g. {'logins': Count(), 'users': DistinctCount('user_id')}
+        where      - field name -> accepted value (or set of values), or a callable taking the split line
+        """
+        self.group_by = tuple(group_by)
+        self._key_fields = [LOG_FIELDS[field] for field in self.group_by]
+        self.aggregates = aggregates or {'count': Count()}
+        self._aggregates = list(self.aggregates.values())
+        if callable(where):
+            self._filters = [where]
+        else:
+            self._filters = [self._field_filter(LOG_FIELDS[field], value) for field, value in (where or {}).items()]
+
+    @staticmethod
+    def _field_filter(field, value):
+        if isinstance(value, (set, frozenset, list, tuple)):
+            values = frozenset(value)
+            return lambda parts: field(parts) in values
+        return lambda parts: field(parts) == value
+
+    def matches(self, parts):
+        for accept in self._filters:
+            if not accept(parts):
+                return False
+        return True
+
+    def key(self, parts):
+        if len(self._key_fields) == 1:
+            # A single group-by field gives plain keys, like the login_counts dict
+            return self._key_fields[0](parts)
+        return tuple(field(parts) for field in self._key_fields)
+
+    def new_states(self):
+        return [aggregate.initial() for aggregate in self._aggregates]
+
+    def update(self, states, parts):
+        for i, aggregate in enumerate(self._aggregates):
+            states[i] = aggregate.update(states[i], parts)
+
+    def results(self, groups):
+        names = list(self.aggregates)
+        return {
+            key: {name: aggregate.result(state) for name, aggregate, state in zip(names, self._aggregates, states)}
+            for key, states in groups.items()
+        }
+
+
+def run_log_queries(lines, queries):
+    """Feed every line to all queries in one pass, returns one {group: {name: value}} dict per query"""
+    groups = [{} for _ in queries]
+    for line in lines:
+        parts = line.split()
+        if len(parts) < 4:
+            continue
+        for query, query_groups in zip(queries, groups):
+            if not query.matches(parts):
+                continue
+            key = query.key(parts)
+            states = query_groups.get(key)
+            if states is None:
+                states = query_groups[key] = query.new_states()
+            query.update(states, parts)
+    return [query.results(query_groups) for query, query_groups in zip(queries, groups)]
+
+
+# Example Usage: three reports, one pass over the file
+start_time = time.time()
+logins_per_day, activity_per_hour, per_user = run_log_queries(log_entries_gen(log_file), [
+    LogQuery(group_by=('date',), where={'action': 'LOGIN'}),
+    LogQuery(group_by=('date', 'hour'), aggregates={'events': Count(), 'users': DistinctCount('user_id')}),
+    LogQuery(group_by=('user_id',), aggregates={'first_seen': FirstSeen(), 'last_seen': LastSeen()},
+             where={'action': {'LOGIN', 'LOGOUT'}}),
+])
+for date, stats in logins_per_day.items():
+    print(f"On {date}, there were {stats['count']} logins.")
+print(f"{len(activity_per_hour)} hourly buckets, {len(per_user)} users seen")
+print("Time taken:", time.time() - start_time, "seconds")
+
+
+"""
+
+Memory-mapped log reader
+
+log_entries_gen decodes every line into a new str and the caller splits it again, even when only one field is
+needed. MmapLogReader maps the file into memory and works on bytes: the mapping is cut into blocks of about 1 MiB
+that end on a newline, every block is split into fields with a single bytes.split() call (C speed, no per-line Python
+work) and the columns are taken with strided slices (dates = fields[0::4], actions = fields[3::4], ...). Only the
+requested fields are handed out and decoded (decode=False keeps them as bytes). Newlines are kept as fields of their
+own during the split, so a block that does not have exactly four fields on every line is detected and falls back to
+line-by-line parsing, where malformed lines are skipped.
+
+Without fields the reader yields whole decoded lines, exactly like log_entries_gen.
+
+Handing out a Python object per field costs as much as the split it saves: MmapLogReader is not faster than
+log_entries_gen + str.split() (see benchmark_readers). count_login_per_day_mmap therefore never creates per-line
+objects. It views each block as a numpy byte array, finds the newlines, keeps the lines whose last 6 bytes are
+" LOGIN", checks that those have four fields and gathers their 10 date bytes in one indexing operation. Dates are
+counted as runs of equal values, the log being in time order. Lines of another shape are split one by one.
+
+"""
+
+import mmap
+import os
+from itertools import compress
+
+import numpy as np
+
+_LOG_COLUMNS = {'date': 0, 'time': 1, 'user_id': 2, 'action': 3}
+
+
+def _mmap_blocks(mm, block_size=1 << 20):
+    """Yield chunks of the mapping that end right after a newline"""
+    size = len(mm)
+    pos = 0
+    while pos < size:
+        end = size
+        if pos + block_size < size:
+            end = mm.rfind(b'\n', pos, pos + block_size) + 1
+            if end <= pos:
+                # A single line longer than block_size
+                end = mm.find(b'\n', pos + block_size) + 1 or size
+        yield mm[pos:end]
+        pos = end
+
+
+# bytes.split() without arguments also splits on these, blocks containing any of them are parsed line by line
+_OTHER_WHITESPACE = (b'\t', b'\r', b'\x0b', b'\x0c')
+
+
+def _block_fields(block):
+    """Flat list of the four fields of every line in the block"""
+    if not block.endswith(b'\n'):
+        block += b'\n'
+    lines = block.count(b'\n')
+    if not any(char in block for char in _OTHER_WHITESPACE):
+        # Every newline becomes a field of its own. The block has four fields on every line exactly when every fifth
+        # field is a newline and no field is empty (two spaces in a row), a field count alone would accept a line with
+        # three fields followed by one with five.
+        fields = block.replace(b'\n', b' \n ').split(b' ')
+        fields.pop()
+        if len(fields) == 5 * lines and fields[4::5].count(b'\n') == lines and b'' not in fields:
+            del fields[4::5]
+            return fields
+    fields = []
+    for line in block.splitlines():
+        parts = line.split()
+        if len(parts) == 4:
+            fields.extend(parts)
+    return fields
+
+
+class MmapLogReader:
+    FIELDS = ('date', 'time', 'hour', 'user_id', 'action')
+
+    def __init__(self, filename, fields=None, decode=True):
+        for field in fields or ():
+            if field not in self.FIELDS:
+                raise ValueError(f"Unknown field {field!r}, expected one of {self.FIELDS}")
+        self.filename = filename
+        self.fields = tuple(fields) if fields else None
+        self.decode = decode
+
+    def __iter__(self):
+        if os.path.getsize(self.filename) == 0:
+            # mmap cannot map an empty file
+            return
+        with open(self.filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if self.fields is None:
+                for line in iter(mm.readline, b''):
+                    yield line.decode()
+                return
+            for block in _mmap_blocks(mm):
+                yield from self._rows(_block_fields(block))
+
+    def _rows(self, fields):
+        columns = []
+        for field in self.fields:
+            if field == 'hour':
+                column = [time_[:2] for time_ in fields[1::4]]
+            else:
+                column = fields[_LOG_COLUMNS[field]::4]
+            columns.append(map(bytes.decode, column) if self.decode else column)
+        return zip(*columns)
+
+
+_DATE_WIDTH = len('2024-01-05')
+
+
+def _count_block_logins(block, login_counts):
+    """Add the LOGIN lines of the block to login_counts (date bytes -> count)"""
+    if not block.endswith(b'\n'):
+        block += b'\n'
+    buf = np.frombuffer(block, np.uint8)
+    ends = np.flatnonzero(buf == ord('\n'))
+    # A LOGIN followed by other whitespace would be missed by the " LOGIN\n" test below
+    if any(char in block for char in _OTHER_WHITESPACE) or np.any(buf[ends - 1] == ord(' ')):
+        fields = _block_fields(block)
+        for date in compress(fields[0::4], map(b'LOGIN'.__eq__, fields[3::4])):
+            login_counts[date] = login_counts.get(date, 0) + 1
+        return
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    # Lines ending with " LOGIN", narrowed down one of the 6 bytes before the newline at a time
+    lines = np.flatnonzero(ends - starts >= 6)
+    for offset, char in enumerate(b' LOGIN', start=-6):
+        lines = lines[buf[ends[lines] + offset] == char]
+    starts, ends = starts[lines], ends[lines]
+    # A line has four fields when it has three spaces with a non-empty field before each of them
+    spaces = np.flatnonzero(buf == ord(' '))
+    first = np.searchsorted(spaces, starts)
+    regular = np.searchsorted(spaces, ends) - first == 3
+    first_spaces, second_spaces = spaces[first[regular]], spaces[first[regular] + 1]
+    regular[regular] = ((first_spaces > starts[regular]) & (second_spaces > first_spaces + 1)
+                        & (ends[regular] - 6 > second_spaces + 1))
+    # The few lines of another shape are split one by one
+    for start, end in zip(starts[~regular].tolist(), ends[~regular].tolist()):
+        parts = block[start:end].split()
+        if len(parts) == 4 and parts[3] == b'LOGIN':
+            login_counts[parts[0]] = login_counts.get(parts[0], 0) + 1
+    starts = starts[regular]
+    if not len(starts):
+        return
+    date_ends = spaces[first[regular]]
+    if not np.all(date_ends - starts == _DATE_WIDTH):
+        # Dates of another width cannot be gathered as one fixed-width array
+        for start, end in zip(starts.tolist(), date_ends.tolist()):
+            date = block[start:end]
+            login_counts[date] = login_counts.get(date, 0) + 1
+        return
+    # One gather of the date bytes of all LOGIN lines. The log is in time order, so equal dates come in runs that are
+    # counted without sorting
+    dates = buf[starts[:, None] + np.arange(_DATE_WIDTH)].view(f'S{_DATE_WIDTH}').ravel()
+    run_starts = np.flatnonzero(np.concatenate(([True], dates[1:] != dates[:-1])))
+    run_lengths = np.diff(np.append(run_starts, len(dates)))
+    for date, count in zip(dates[run_starts].tolist(), run_lengths.tolist()):
+        login_counts[date] = login_counts.get(date, 0) + count
+
+
+def count_login_per_day_mmap(filename, block_size=1 << 24):
+    login_counts = {}
+    if os.path.getsize(filename) == 0:
+        return login_counts
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for block in _mmap_blocks(mm, block_size):
+            _count_block_logins(block, login_counts)
+    # Only the distinct dates get decoded
+    return {date.decode(): count for date, count in login_counts.items()}
+
+
+def _count_pairs(pairs):
+    login_counts = {}
+    for date, action in pairs:
+        if action == 'LOGIN':
+            login_counts[date] = login_counts.get(date, 0) + 1
+    return login_counts
+
+
+def benchmark_readers(filename=log_file):
+    """Every case of a group does the same work, the login counts per day are checked to be equal"""
+    size = os.path.getsize(filename)
+    for group in (
+            (("log_entries_gen lines", lambda: sum(1 for _ in log_entries_gen(filename))),
+             ("MmapLogReader lines", lambda: sum(1 for _ in MmapLogReader(filename)))),
+            (("log_entries_gen + split", lambda: _count_pairs(parts[::3] for parts in map(str.split,
+                                                                                           log_entries_gen(filename)))),
+             ("MmapLogReader fields", lambda: _count_pairs(MmapLogReader(filename, ('date', 'action')))),
+             ("count_login_per_day_mmap", lambda: count_login_per_day_mmap(filename))),
+    ):
+        results = []
+        for name, scan in group:
+            start = time.perf_counter()
+            results.append(scan())
+            elapsed = time.perf_counter() - start
+            print(f"{name:>26}: {size / elapsed / 1024 ** 2:.1f} MiB/s")
+        assert all(result == results[0] for result in results)
+
+
+
+"""
+
+Incremental login counting
+
+Running count_login_per_day every few minutes rescans the whole, ever growing file. IncrementalLoginCounter remembers
+how far it has read: the byte offset after the last complete line, the login_counts collected so far and the identity
+(inode and device) of the file. The state is saved to a JSON checkpoint file, so the next run (even in a new process)
+only reads the bytes appended since then.
+
+    - A different inode means the log was rotated (renamed away and recreated), a size below the offset means it was
+      truncated in place. A truncation followed by new writes past the old offset before the next update (logrotate's
+      copytruncate) keeps inode and size plausible, so the checkpoint also stores a fingerprint: a hash of the last
+      bytes before the offset. When they no longer match, the file was rewritten. In all cases reading starts again at
+      byte 0 of the current file. The counts collected so far are kept, since they describe lines that really were
+      logged (reset_on_rotation=True drops them instead).
+    - A last line without a trailing newline is still being written, it is left for the next update.
+    - follow() turns the counter into a `tail -f`: it polls the file and yields the counts whenever new lines arrive.
+
+"""
+
+import hashlib
+import json
+
+_FINGERPRINT_BYTES = 64
+
+
+class IncrementalLoginCounter:
+    def __init__(self, filename, checkpoint_path=None, reset_on_rotation=False, block_size=1 << 20):
+        self.filename = filename
+        self.checkpoint_path = checkpoint_path or f"{filename}.checkpoint.json"
+        self.reset_on_rotation = reset_on_rotation
+        self.block_size = block_size
+        self.inode = None
+        self.device = None
+        self.offset = 0
+        self.fingerprint = None
+        self.login_counts = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path) as f:
+            state = json.load(f)
+        self.inode = state['inode']
+        self.device = state['device']
+        self.offset = state['offset']
+        # Checkpoints written before fingerprints were added cannot be verified
+        self.fingerprint = state.get('fingerprint')
+        self.login_counts = state['login_counts']
+
+    def _save(self):
+        state = {'inode': self.inode, 'device': self.device, 'offset': self.offset, 'fingerprint': self.fingerprint,
+                 'login_counts': self.login_counts}
+        # Write and rename, so a crash never leaves a half-written checkpoint behind
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _fingerprint(self, f):
+        """Hash of the bytes just before offset, they change when the file is rewritten in place"""
+        start = max(0, self.offset - _FINGERPRINT_BYTES)
+        f.seek(start)
+        return hashlib.blake2b(f.read(self.offset - start), digest_size=8).hexdigest()
+
+    def update(self):
+        """Count the lines appended since the last update, returns the number of new lines"""
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            # Between rotation and the creation of the new file
+            return 0
+        rotated = (stat.st_ino, stat.st_dev) != (self.inode, self.device) or stat.st_size < self.offset
+
+        new_lines = 0
+        login_counts = self.login_counts
+        with open(self.filename, 'rb') as f:
+            if not rotated and self.offset and self.fingerprint is not None:
+                rotated = self._fingerprint(f) != self.fingerprint
+            if rotated:
+                if self.reset_on_rotation or self.inode is None:
+                    login_counts = self.login_counts = {}
+                self.inode, self.device = stat.st_ino, stat.st_dev
+                self.offset = 0
+            if stat.st_size == self.offset:
+                if rotated:
+                    self.fingerprint = self._fingerprint(f)
+                    self._save()
+                return 0
+
+            f.seek(self.offset)
+            pending = b''
+            while True:
+                block = f.read(self.block_size)
+                if not block:
+                    break
+                block = pending + block
+                end = block.rfind(b'\n') + 1
+                pending = block[end:]
+                for line in block[:end].splitlines():
+                    parts = line.split()
+                    if len(parts) >= 4 and parts[3] == b'LOGIN':
+                        date = parts[0].decode()
+                        login_counts[date] = login_counts.get(date, 0) + 1
+                    new_lines += 1
+                self.offset += end
+            self.fingerprint = self._fingerprint(f)
+        self._save()
+        return new_lines
+
+    def follow(self, poll_interval=1.0):
+        """Like `tail -f`: yield login_counts every time new lines have been counted, runs until closed"""
+        while True:
+            if self.update():
+                yield dict(self.login_counts)
+            else:
+                time.sleep(poll_interval)
+
+
+def benchmark_incremental(filename=log_file):
+    checkpoint = "benchmark.checkpoint.json"
+    for run in ("first run", "refresh"):
+        start = time.perf_counter()
+        IncrementalLoginCounter(filename, checkpoint_path=checkpoint).update()
+        print(f"IncrementalLoginCounter {run}: {time.perf_counter() - start:.4f}s")
+    os.remove(checkpoint)
+
+
+# The examples and benchmarks write files and read the whole log, they only run when the module is executed directly
+if __name__ == '__main__':
+    # Example Usage: the second update only reads the two appended lines
+    with open("tail_example.log", 'w') as example:
+        example.write("2024-01-05 10:00:00 1001 LOGIN\n2024-01-05 10:00:01 1002 LOGOUT\n")
+    counter = IncrementalLoginCounter("tail_example.log")
+    counter.update()
+    with open("tail_example.log", 'a') as example:
+        example.write("2024-01-05 10:00:02 1003 LOGIN\n2024-01-06 00:00:00 1004 LOGIN\n")
+    print(counter.update(), counter.offset, counter.login_counts)  # Expected: 2 125 {'2024-01-05': 2, '2024-01-06': 1}
+    # copytruncate: emptied in place and refilled past the old offset before the next update, all five lines are counted
+    with open("tail_example.log", 'r+') as example:
+        example.truncate(0)
+        example.writelines(f"2024-01-07 10:00:0{i} 100{i} LOGIN\n" for i in range(5))
+    print(counter.update(), counter.login_counts['2024-01-07'])  # Expected: 5 5
+    os.remove("tail_example.log")
+    os.remove(counter.checkpoint_path)
+
+    benchmark_readers()
+    benchmark_incremental()
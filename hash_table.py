@@ -40,22 +40,147 @@ with a given key.
 
 """
 
+from collections.abc import MutableMapping
+from itertools import islice, repeat
 
-class HashTable:
-    def __init__(self, size=10):
+_MISSING = object()
+
+# Buckets are stored in segments of _SEGMENT_SIZE, the table itself is a short list of segments. Growing the table
+# allocates that short list, segments are created when the first key lands in them and freed one by one as the rehash
+# moves past them, so no single call allocates or frees one list with millions of slots.
+_SEGMENT_BITS = 10
+_SEGMENT_SIZE = 1 << _SEGMENT_BITS
+_SEGMENT_MASK = _SEGMENT_SIZE - 1
+
+
+def _segments(size):
+    """Empty segmented bucket array for size buckets"""
+    return [None] * ((size + _SEGMENT_MASK) >> _SEGMENT_BITS)
+
+
+def _buckets(segments, start, stop):
+    """Buckets (None where empty) of a segmented bucket array with indices in [start, stop)"""
+    index = start
+    while index < stop:
+        segment = segments[index >> _SEGMENT_BITS]
+        segment_stop = min((index | _SEGMENT_MASK) + 1, stop)
+        if segment is None:
+            yield from repeat(None, segment_stop - index)
+        else:
+            yield from islice(segment, index & _SEGMENT_MASK, ((segment_stop - 1) & _SEGMENT_MASK) + 1)
+        index = segment_stop
+
+
+def seeded_mixer(seed=0):
+    """Return a hash function that scrambles hash(key) with a seeded 64-bit mixer (splitmix64 finalizer)
+
+    Keys sharing a stride (0, 1024, 2048, ...) land in the same few buckets with hash(key) % size, after mixing every
+    bit of the key affects the bucket index. The result is non-negative and fits in 63 bits.
+    """
+    offset = (seed * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+
+    def mix(key):
+        x = (hash(key) + offset) & 0xFFFFFFFFFFFFFFFF
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+        return (x ^ (x >> 31)) >> 1
+
+    return mix
+
+
+class HashTable(MutableMapping):
+    def __init__(self, size=10, max_load_factor=0.75, min_load_factor=0.1, rehash_step=4, hash_function=hash):
         self.size = size
-        # Initialize empty buckets
-        self.table = [[] for _ in range(self.size)]
+        self.hash_function = hash_function
+        # Initialize empty buckets, segments and bucket lists are only created when the first key lands in them
+        self.table = _segments(self.size)
+        self.count = 0
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        # How many old buckets are moved to the new table on every operation while a rehash is running
+        self.rehash_step = rehash_step
+        self._min_size = size
+        # Old bucket array kept alive while its buckets are migrated incrementally
+        self._old_table = None
+        self._old_size = 0
+        self._rehash_index = 0
+
+    @property
+    def load_factor(self):
+        """Number of stored keys per bucket"""
+        return self.count / self.size
 
     def _hash(self, key):
         """Compute an index in the range [0, size - 1]"""
-        hash_ = hash(key) % self.size
+        hash_ = self.hash_function(key) % self.size
         return hash_
 
+    def _locate(self, key):
+        """Return the bucket array and the index that currently hold (or should hold) the key"""
+        if self._old_table is not None:
+            old_index = self.hash_function(key) % self._old_size
+            if old_index >= self._rehash_index:
+                # This bucket has not been migrated yet
+                return self._old_table, old_index
+        return self.table, self._hash(key)
+
+    def _resize(self, new_size):
+        """Start moving all keys into a new bucket array of new_size"""
+        if self._old_table is not None:
+            # Previous rehash is still running, finish it before starting the next one
+            self._rehash(self._old_size)
+        self._old_table = self.table
+        self._old_size = self.size
+        self._rehash_index = 0
+        self.size = new_size
+        self.table = _segments(self.size)
+
+    def _rehash(self, steps):
+        """Move up to `steps` buckets from the old table into the new one"""
+        if self._old_table is None:
+            return
+        old_table = self._old_table
+        table = self.table
+        size = self.size
+        hash_function = self.hash_function
+        index = self._rehash_index
+        end = min(index + steps, self._old_size)
+        while index < end:
+            segment = old_table[index >> _SEGMENT_BITS]
+            if segment is None:
+                # Nothing was ever stored in this segment
+                index = min((index | _SEGMENT_MASK) + 1, end)
+                continue
+            for k, v in segment[index & _SEGMENT_MASK] or ():
+                new_index = hash_function(k) % size
+                new_segment = table[new_index >> _SEGMENT_BITS]
+                if new_segment is None:
+                    new_segment = table[new_index >> _SEGMENT_BITS] = [None] * _SEGMENT_SIZE
+                new_bucket = new_segment[new_index & _SEGMENT_MASK]
+                if new_bucket is None:
+                    new_segment[new_index & _SEGMENT_MASK] = [(k, v)]
+                else:
+                    new_bucket.append((k, v))
+            index += 1
+            if not index & _SEGMENT_MASK:
+                # Whole segment migrated, free it now instead of together with the rest of the old table
+                old_table[(index - 1) >> _SEGMENT_BITS] = None
+        self._rehash_index = end
+        if end == self._old_size:
+            self._old_table = None
+            self._old_size = 0
+            self._rehash_index = 0
+
     def set(self, key, value):
         """Insert or update the key-value pair"""
-        index = self._hash(key)
-        bucket = self.table[index]
+        self._rehash(self.rehash_step)
+        table, index = self._locate(key)
+        segment = table[index >> _SEGMENT_BITS]
+        if segment is None:
+            segment = table[index >> _SEGMENT_BITS] = [None] * _SEGMENT_SIZE
+        bucket = segment[index & _SEGMENT_MASK]
+        if bucket is None:
+            bucket = segment[index & _SEGMENT_MASK] = []
 
         for i, (k, v) in enumerate(bucket):
             if k == key:
@@ -64,31 +189,199 @@ class HashTable:
                 return
         # Key not found, append to the bucket
         bucket.append((key, value))
+        self.count += 1
+        if self.count > self.size * self.max_load_factor:
+            self._resize(self.size * 2)
 
-    def get(self, key):
+    def get(self, key, default=None):
         """Retrieve the value associated with the key"""
-        index = self._hash(key)
-        bucket = self.table[index]
+        self._rehash(self.rehash_step)
+        table, index = self._locate(key)
+        segment = table[index >> _SEGMENT_BITS]
+        if segment is None:
+            return default
 
-        for k, v in bucket:
+        for k, v in segment[index & _SEGMENT_MASK] or ():
             if k == key:
                 return v
-        return None
+        return default
 
-    def remove(self, key):
-        """Remove the key and its associated value"""
-        index = self._hash(key)
-        bucket = self.table[index]
+    def _discard(self, key):
+        """Remove the key if present, without rehash steps or shrinking. Returns whether it was found"""
+        table, index = self._locate(key)
+        segment = table[index >> _SEGMENT_BITS]
+        bucket = segment[index & _SEGMENT_MASK] or [] if segment is not None else []
 
         for i, (k, v) in enumerate(bucket):
             if k == key:
                 bucket.pop(i)
-                return
-        raise KeyError(f"Key {key} not found")
+                self.count -= 1
+                return True
+        return False
+
+    def remove(self, key):
+        """Remove the key and its associated value"""
+        self._rehash(self.rehash_step)
+        if not self._discard(key):
+            raise KeyError(f"Key {key} not found")
+        self._maybe_shrink()
+
+    def _maybe_shrink(self):
+        if self.size > self._min_size and self.count < self.size * self.min_load_factor:
+            self._resize(max(self.size // 2, self._min_size))
+
+    def reserve(self, n):
+        """Presize the table so that n more keys fit without another resize"""
+        needed = int((self.count + n) / self.max_load_factor) + 1
+        if needed > self.size:
+            # Only a bulk load that really needs the space pays for a whole rehash at once
+            self._resize(needed)
+            self._rehash(self._old_size)
+
+    def update(self, other=(), **kwargs):
+        """Insert many key-value pairs from a mapping or an iterable of pairs"""
+        if hasattr(other, 'keys'):
+            other = other.items()
+        elif not hasattr(other, '__len__'):
+            other = list(other)
+        self.reserve(len(other) + len(kwargs))
+        self._rehash(self.rehash_step * (len(other) + len(kwargs)))
+        if self._old_table is not None:
+            # A rehash is still running, keep paying for it in steps like set() does
+            for pairs in (other, kwargs.items()):
+                for key, value in pairs:
+                    self.set(key, value)
+            return
+
+        # Table is presized and fully rehashed, so pairs go straight into their buckets
+        table = self.table
+        size = self.size
+        count = self.count
+        hash_function = self.hash_function
+        for pairs in (other, kwargs.items()):
+            for key, value in pairs:
+                index = hash_function(key) % size
+                segment = table[index >> _SEGMENT_BITS]
+                if segment is None:
+                    segment = table[index >> _SEGMENT_BITS] = [None] * _SEGMENT_SIZE
+                index &= _SEGMENT_MASK
+                bucket = segment[index]
+                if bucket is None:
+                    segment[index] = [(key, value)]
+                    count += 1
+                    continue
+                for i, (k, v) in enumerate(bucket):
+                    if k == key:
+                        bucket[i] = (key, value)
+                        break
+                else:
+                    bucket.append((key, value))
+                    count += 1
+        self.count = count
+
+    def get_many(self, keys, default=None):
+        """Retrieve the values of many keys in one pass, missing keys give default"""
+        keys = list(keys)
+        self._rehash(self.rehash_step * len(keys))
+        if self._old_table is not None:
+            return [self.get(key, default) for key in keys]
+
+        table = self.table
+        size = self.size
+        hash_function = self.hash_function
+        values = []
+        for key in keys:
+            index = hash_function(key) % size
+            segment = table[index >> _SEGMENT_BITS]
+            for k, v in segment[index & _SEGMENT_MASK] or () if segment is not None else ():
+                if k == key:
+                    values.append(v)
+                    break
+            else:
+                values.append(default)
+        return values
+
+    def remove_many(self, keys):
+        """Remove many keys in one pass, missing keys are skipped. Returns the number of removed keys"""
+        keys = list(keys)
+        removed = 0
+        self._rehash(self.rehash_step * len(keys))
+        if self._old_table is not None:
+            removed = sum(map(self._discard, keys))
+            self._maybe_shrink()
+            return removed
+
+        table = self.table
+        size = self.size
+        hash_function = self.hash_function
+        for key in keys:
+            index = hash_function(key) % size
+            segment = table[index >> _SEGMENT_BITS]
+            bucket = segment[index & _SEGMENT_MASK] if segment is not None else None
+            if not bucket:
+                continue
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    bucket.pop(i)
+                    removed += 1
+                    break
+        self.count -= removed
+        # Shrink once at the end instead of after every key
+        self._maybe_shrink()
+        return removed
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.remove(key)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        # items() and values() call __getitem__ for every key, which moves old buckets into the new table. Finish the
+        # rehash first, otherwise keys migrated during the iteration would be yielded a second time.
+        self._rehash(self._old_size)
+        for bucket in _buckets(self.table, 0, self.size):
+            for k, v in bucket or ():
+                yield k
+
+    def clear(self):
+        self.__init__(self._min_size, self.max_load_factor, self.min_load_factor, self.rehash_step, self.hash_function)
+
+    def diagnostics(self):
+        """Bucket length distribution, chain lengths and expected probe counts"""
+        # Statistics describe one bucket array of `size` buckets, so keys still waiting in the old array are moved first
+        self._rehash(self._old_size)
+        lengths = [len(bucket) if bucket else 0 for bucket in _buckets(self.table, 0, self.size)]
+        histogram = {}
+        for length in lengths:
+            histogram[length] = histogram.get(length, 0) + 1
+        return {
+            'size': self.size,
+            'count': self.count,
+            'load_factor': self.load_factor,
+            'empty_buckets': histogram.get(0, 0),
+            'max_chain': max(lengths, default=0),
+            'histogram': dict(sorted(histogram.items())),
+            # A hit scans on average half of its chain, a miss scans a whole chain
+            'avg_probes_hit': sum(n * (n + 1) / 2 for n in lengths) / self.count if self.count else 0.0,
+            'avg_probes_miss': sum(n * n for n in lengths) / self.count if self.count else 0.0,
+        }
 
     def __str__(self):
         """String representation of the hash table"""
-        return str(self.table)
+        return str([bucket or [] for bucket in _buckets(self.table, 0, self.size)])
 
 
 # Example Usage:
@@ -111,3 +404,1049 @@ print(ht.get("name"))  # Expected: Mike
 # Remove a key
 ht.remove("city")
 print(ht)  # city key-value pair should be gone
+
+
+"""
+Automatic resizing
+
+The table keeps track of its load factor (keys / buckets). Once it goes above max_load_factor the bucket array is
+doubled, and once it drops below min_load_factor after removals it is halved (never below the initial size).
+Instead of moving every key at once, the old bucket array is kept and `rehash_step` of its buckets are moved on every
+set/get/remove, so no single call pays for the whole rehash. Lookups check the old bucket when it has not been
+migrated yet. The bucket arrays are segmented (see _SEGMENT_SIZE): a resize only allocates the short list of segments,
+so the call that crosses the threshold costs about the same at 1k and at 10M keys.
+"""
+
+import gc
+import time
+
+
+def benchmark_per_op_latency(sizes=(10, 1_000, 100_000, 1_000_000), max_resize_pause=0.001):
+    """Average, p99 and worst single set() latency for tables of growing size
+
+    The calls that start a resize must stay below max_resize_pause at every size. The overall worst call is only
+    printed, it also contains scheduler and page fault noise that has nothing to do with the table.
+    """
+    for n in sizes:
+        table = HashTable()
+        latencies = []
+        resize_pauses = []
+        # Full GC passes over millions of bucket tuples would show up as pauses that are not caused by the table
+        gc.disable()
+        try:
+            for i in range(n):
+                size = table.size
+                op_start = time.perf_counter()
+                table.set(i, i)
+                latency = time.perf_counter() - op_start
+                latencies.append(latency)
+                if table.size != size:
+                    resize_pauses.append(latency)
+        finally:
+            gc.enable()
+        for i in range(n):
+            assert table.get(i) == i
+        latencies.sort()
+        worst_resize = max(resize_pauses, default=0.0)
+        print(f"{n:>10} keys: {sum(latencies) / n * 1e6:.2f} us/op avg, "
+              f"{latencies[int(n * 0.99)] * 1e6:.2f} us p99, {latencies[-1] * 1e6:.1f} us worst, "
+              f"{worst_resize * 1e6:.1f} us worst resize, size={table.size}, load={table.load_factor:.2f}")
+        assert worst_resize < max_resize_pause, f"resize at {n} keys paused for {worst_resize * 1e3:.2f} ms"
+
+
+"""
+Open addressing
+
+Chaining keeps a Python list per bucket and a (key, value) tuple per entry. OpenAddressingHashTable stores the same
+data in three flat parallel arrays instead: the cached hash of every slot (array('q'), 8 bytes per slot), the keys and
+the values. On a collision the next slot is probed (linear probing). Removed keys leave a tombstone behind so that
+probe chains running through the slot are not cut, tombstones are reused by later inserts and dropped on resize.
+The cached hash lets probing skip slots without calling __eq__ on their keys. hash_function may return any int, it is
+folded to 63 bits to fit the signed 64-bit hash array.
+"""
+
+from array import array
+
+_EMPTY = object()
+_DELETED = object()
+_HASH_MASK = (1 << 63) - 1
+
+
+class OpenAddressingHashTable(MutableMapping):
+    def __init__(self, size=8, max_load_factor=0.6, hash_function=hash):
+        self.hash_function = hash_function
+        # Capacity is kept a power of two so the index is a cheap bit mask
+        self.size = 1 << max(3, (size - 1).bit_length())
+        self.max_load_factor = max_load_factor
+        self.hashes = array('q', [0]) * self.size
+        self.keys = [_EMPTY] * self.size
+        self.values = [None] * self.size
+        self.count = 0
+        # Live keys plus tombstones, both make probe chains longer
+        self._used = 0
+
+    @property
+    def load_factor(self):
+        """Number of stored keys per slot"""
+        return self.count / self.size
+
+    def _hash(self, key):
+        """hash_function(key) folded into the non-negative range of array('q')"""
+        return self.hash_function(key) & _HASH_MASK
+
+    def _probe(self, key, hash_):
+        """Return (index of the key or -1, first slot where the key could be inserted)"""
+        mask = self.size - 1
+        keys = self.keys
+        hashes = self.hashes
+        index = hash_ & mask
+        free = -1
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                return -1, index if free < 0 else free
+            if k is _DELETED:
+                if free < 0:
+                    free = index
+            elif hashes[index] == hash_ and (k is key or k == key):
+                return index, index
+            index = (index + 1) & mask
+
+    def _resize(self, new_size):
+        """Reinsert every live key into fresh arrays, tombstones are dropped"""
+        old = zip(self.hashes, self.keys, self.values)
+        self.size = new_size
+        self.hashes = array('q', [0]) * new_size
+        self.keys = [_EMPTY] * new_size
+        self.values = [None] * new_size
+        self._used = self.count
+        mask = new_size - 1
+        for hash_, k, v in old:
+            if k is _EMPTY or k is _DELETED:
+                continue
+            index = hash_ & mask
+            while self.keys[index] is not _EMPTY:
+                index = (index + 1) & mask
+            self.hashes[index] = hash_
+            self.keys[index] = k
+            self.values[index] = v
+
+    def set(self, key, value):
+        """Insert or update the key-value pair"""
+        hash_ = self._hash(key)
+        index, free = self._probe(key, hash_)
+        if index >= 0:
+            # Key found, update its value
+            self.values[index] = value
+            return
+        if self.keys[free] is _EMPTY:
+            if self._used + 1 > self.size * self.max_load_factor:
+                # Grow only when live keys need it, otherwise just clean out the tombstones
+                grow = self.count + 1 > self.size * self.max_load_factor / 2
+                self._resize(self.size * 2 if grow else self.size)
+                index, free = self._probe(key, hash_)
+            self._used += 1
+        self.hashes[free] = hash_
+        self.keys[free] = key
+        self.values[free] = value
+        self.count += 1
+
+    def get(self, key, default=None):
+        """Retrieve the value associated with the key"""
+        index, _ = self._probe(key, self._hash(key))
+        if index < 0:
+            return default
+        return self.values[index]
+
+    def remove(self, key):
+        """Remove the key and its associated value"""
+        index, _ = self._probe(key, self._hash(key))
+        if index < 0:
+            raise KeyError(f"Key {key} not found")
+        self.keys[index] = _DELETED
+        self.values[index] = None
+        self.count -= 1
+
+    def reserve(self, n):
+        """Presize the arrays so that n more keys fit without another resize"""
+        needed = int((self.count + n) / self.max_load_factor) + 1
+        if needed > self.size or self._used + n > self.size * self.max_load_factor:
+            self._resize(1 << max(3, (max(needed, self.size) - 1).bit_length()))
+
+    def update(self, other=(), **kwargs):
+        """Insert many key-value pairs from a mapping or an iterable of pairs"""
+        if hasattr(other, 'keys'):
+            other = other.items()
+        elif not hasattr(other, '__len__'):
+            other = list(other)
+        # After presizing no insert can trigger a resize, so set() never rebuilds the arrays mid-way
+        self.reserve(len(other) + len(kwargs))
+        for pairs in (other, kwargs.items()):
+            for key, value in pairs:
+                self.set(key, value)
+
+    def get_many(self, keys, default=None):
+        """Retrieve the values of many keys in one pass, missing keys give default"""
+        probe = self._probe
+        hash_key = self._hash
+        values = self.values
+        result = []
+        for key in keys:
+            index, _ = probe(key, hash_key(key))
+            result.append(default if index < 0 else values[index])
+        return result
+
+    def remove_many(self, keys):
+        """Remove many keys in one pass, missing keys are skipped. Returns the number of removed keys"""
+        removed = 0
+        for key in keys:
+            index, _ = self._probe(key, self._hash(key))
+            if index >= 0:
+                self.keys[index] = _DELETED
+                self.values[index] = None
+                removed += 1
+        self.count -= removed
+        return removed
+
+    def __getitem__(self, key):
+        index, _ = self._probe(key, self._hash(key))
+        if index < 0:
+            raise KeyError(key)
+        return self.values[index]
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.remove(key)
+
+    def __contains__(self, key):
+        return self._probe(key, self._hash(key))[0] >= 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for k in self.keys:
+            if k is not _EMPTY and k is not _DELETED:
+                yield k
+
+    def clear(self):
+        self.__init__(8, self.max_load_factor, self.hash_function)
+
+    def diagnostics(self):
+        """Probe length distribution, tombstones and load factor"""
+        mask = self.size - 1
+        histogram = {}
+        total = 0
+        for index, (hash_, k) in enumerate(zip(self.hashes, self.keys)):
+            if k is _EMPTY or k is _DELETED:
+                continue
+            # Slots visited by a successful lookup: home slot up to and including this one
+            probes = ((index - hash_) & mask) + 1
+            histogram[probes] = histogram.get(probes, 0) + 1
+            total += probes
+        return {
+            'size': self.size,
+            'count': self.count,
+            'load_factor': self.load_factor,
+            'tombstones': self._used - self.count,
+            'max_probes': max(histogram, default=0),
+            'histogram': dict(sorted(histogram.items())),
+            'avg_probes_hit': total / self.count if self.count else 0.0,
+        }
+
+    def __str__(self):
+        """String representation of the hash table"""
+        return str([(k, v) for k, v in zip(self.keys, self.values) if k is not _EMPTY and k is not _DELETED])
+
+
+# Example Usage:
+oht = OpenAddressingHashTable()
+oht.set("name", "John")
+oht.set("age", 25)
+oht.set("city", "New York")
+print(oht)
+oht.set("name", "Mike")
+oht.remove("city")
+print(oht.get("name"), oht.get("city"))  # Expected: Mike None
+
+
+import tracemalloc
+
+
+def benchmark_backends(n=200_000):
+    """Bytes per entry and set/get throughput of the chaining and open addressing tables"""
+    keys = [f"key-{i}" for i in range(n)]
+    for cls in (HashTable, OpenAddressingHashTable):
+        # Keys double as values so only the table's own structures are counted
+        tracemalloc.start()
+        table = cls()
+        for key in keys:
+            table.set(key, key)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del table
+
+        start = time.perf_counter()
+        table = cls()
+        for key in keys:
+            table.set(key, key)
+        set_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for key in keys:
+            table.get(key)
+        get_time = time.perf_counter() - start
+        print(f"{cls.__name__:>24}: {memory / n:.1f} bytes/entry, "
+              f"set {n / set_time / 1e6:.2f} Mops/s, get {n / get_time / 1e6:.2f} Mops/s")
+
+
+"""
+Mapping protocol and bulk operations
+
+Both tables are collections.abc.MutableMapping, so len(), `in`, iteration, items(), keys(), values(), pop() and
+`table[key]` work like on a dict. update() presizes the table once for all incoming pairs and inserts them without
+any resize in between, get_many() and remove_many() handle a whole batch of keys per call.
+"""
+
+ht = HashTable()
+ht.update({"name": "John", "age": 25}, city="New York")
+print(len(ht), "age" in ht, sorted(ht.items()))
+print(ht.get_many(["name", "city", "country"]))  # Expected: ['John', 'New York', None]
+print(ht.remove_many(["age", "country"]), dict(ht))  # Expected: 1 {...}
+
+# Iteration in the middle of an incremental rehash sees every key exactly once
+ht = HashTable()
+for i in range(1000):
+    ht.set(i, i)
+assert ht._old_table is not None
+assert len(list(ht.items())) == len(list(ht.values())) == len(ht) == 1000
+
+
+def benchmark_bulk_load(n=500_000):
+    """Loading n pairs one set() at a time versus a single update()"""
+    pairs = [(f"key-{i}", i) for i in range(n)]
+    for cls in (HashTable, OpenAddressingHashTable):
+        start = time.perf_counter()
+        table = cls()
+        for key, value in pairs:
+            table.set(key, value)
+        one_by_one = time.perf_counter() - start
+
+        start = time.perf_counter()
+        table = cls()
+        table.update(pairs)
+        bulk = time.perf_counter() - start
+        print(f"{cls.__name__:>24}: set() loop {one_by_one:.2f}s, update() {bulk:.2f}s")
+
+
+"""
+Concurrent access
+
+A single lock around the whole table serializes every set/get. ConcurrentHashTable splits the keys into stripes, each
+stripe is an independent HashTable guarded by its own lock, so threads working on different stripes never wait for
+each other. Every stripe grows and rehashes incrementally on its own, a resize only holds the lock of the stripe being
+resized. The stripe index is taken from the top bits of a multiplicative hash so that it does not correlate with the
+bucket index (hash % size) used inside the stripe.
+
+Note: on CPython with the GIL only one thread runs Python code at a time, striping removes lock contention and
+convoying but the throughput gain is bounded; free-threaded builds benefit fully.
+"""
+
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LockedHashTable(MutableMapping):
+    """HashTable behind one global lock, the baseline for ConcurrentHashTable"""
+
+    def __init__(self, size=10):
+        self._table = HashTable(size)
+        self._lock = threading.Lock()
+
+    def set(self, key, value):
+        with self._lock:
+            self._table.set(key, value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._table.get(key, default)
+
+    def remove(self, key):
+        with self._lock:
+            self._table.remove(key)
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._table[key]
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.remove(key)
+
+    def __len__(self):
+        return len(self._table)
+
+    def __iter__(self):
+        with self._lock:
+            keys = list(self._table)
+        return iter(keys)
+
+
+class ConcurrentHashTable(MutableMapping):
+    def __init__(self, size=10, stripes=16, hash_function=hash):
+        self.hash_function = hash_function
+        # Stripe count is a power of two so the stripe index is the top bits of a 64-bit mixed hash
+        self._bits = max(1, (stripes - 1).bit_length())
+        self.stripes = 1 << self._bits
+        per_stripe = max(1, size // self.stripes)
+        self._tables = [HashTable(per_stripe, hash_function=hash_function) for _ in range(self.stripes)]
+        self._locks = [threading.Lock() for _ in range(self.stripes)]
+
+    def _stripe(self, key):
+        """Index of the stripe responsible for the key"""
+        return ((self.hash_function(key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - self._bits)
+
+    def set(self, key, value):
+        """Insert or update the key-value pair"""
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            self._tables[stripe].set(key, value)
+
+    def get(self, key, default=None):
+        """Retrieve the value associated with the key"""
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            return self._tables[stripe].get(key, default)
+
+    def remove(self, key):
+        """Remove the key and its associated value"""
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            self._tables[stripe].remove(key)
+
+    def __getitem__(self, key):
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            return self._tables[stripe][key]
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.remove(key)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        # Counts are read without locking, the result is exact only when no writer is running
+        return sum(len(table) for table in self._tables)
+
+    def __iter__(self):
+        # Every stripe is copied under its own lock, the table as a whole is never frozen
+        for lock, table in zip(self._locks, self._tables):
+            with lock:
+                keys = list(table)
+            yield from keys
+
+    def __str__(self):
+        """String representation of the hash table"""
+        return str(dict(self.items()))
+
+
+# Example Usage:
+cht = ConcurrentHashTable()
+cht.set("name", "John")
+cht["age"] = 25
+print(cht.get("name"), cht["age"], len(cht))  # Expected: John 25 2
+
+
+def benchmark_concurrent(threads=8, ops_per_thread=100_000, key_space=50_000):
+    """Mixed set/get/remove stress test of the single lock wrapper and the striped table"""
+    for cls in (LockedHashTable, ConcurrentHashTable):
+        table = cls()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            # Each thread owns the keys equal to its seed modulo `threads`, so it can check its own writes
+            own = {}
+            for _ in range(ops_per_thread):
+                key = rng.randrange(key_space) * threads + seed
+                op = rng.random()
+                if op < 0.3:
+                    table.set(key, op)
+                    own[key] = op
+                elif op < 0.9:
+                    assert table.get(key) == own.get(key)
+                elif key in own:
+                    table.remove(key)
+                    del own[key]
+            for key, value in own.items():
+                assert table.get(key) == value
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            futures = [pool.submit(worker, seed) for seed in range(threads)]
+        elapsed = time.perf_counter() - start
+        # A failed consistency check in a worker is re-raised here instead of only printing a thread traceback
+        for future in futures:
+            future.result()
+        print(f"{cls.__name__:>20}: {threads} threads, {threads * ops_per_thread / elapsed / 1e6:.2f} Mops/s, "
+              f"{len(table)} keys")
+
+
+"""
+Persistent memory-mapped table
+
+PersistentHashTable keeps an open addressing table in a file and reads it through mmap, so opening a prebuilt table
+costs a header read instead of replaying millions of set() calls, and several processes that open the same file share
+its pages through the OS page cache. Keys and values can be bytes, str or int.
+
+File layout:
+    header  - magic, version, number of slots, number of keys
+    slots   - (hash, record offset) pairs, offset 0 marks an empty slot
+    records - key type, key length, value type, value length, key bytes, value bytes
+
+Python's hash() of str/bytes changes between processes, so the file uses a stable 64-bit blake2b hash. Lookups compare
+the encoded key directly against the mapped bytes and only decode the value that is returned.
+
+Writes are copy-on-write: in "w" mode changes are kept in memory and commit() writes a complete new file next to the
+old one, fsyncs it and atomically renames it over the original. A crash at any point leaves either the old or the new
+table on disk, never a half-written one, and readers that still map the old file keep seeing a consistent snapshot.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+
+_HEADER = struct.Struct('<4sIQQ')
+_SLOT = struct.Struct('<QQ')
+_RECORD = struct.Struct('<BIBI')
+_MAGIC = b'PSHT'
+_VERSION = 1
+_BYTES, _STR, _INT = 0, 1, 2
+
+
+def _encode(obj):
+    """Return (type tag, bytes) for a supported key or value"""
+    if isinstance(obj, bytes):
+        return _BYTES, obj
+    if isinstance(obj, str):
+        return _STR, obj.encode('utf-8')
+    if isinstance(obj, int) and not isinstance(obj, bool):
+        return _INT, obj.to_bytes((obj.bit_length() + 8) // 8, 'little', signed=True)
+    raise TypeError(f"Unsupported type {type(obj).__name__}, expected bytes, str or int")
+
+
+def _decode(tag, data):
+    if tag == _BYTES:
+        return bytes(data)
+    if tag == _STR:
+        return str(data, 'utf-8')
+    return int.from_bytes(data, 'little', signed=True)
+
+
+def _stable_hash(tag, data):
+    return int.from_bytes(hashlib.blake2b(bytes((tag,)) + data, digest_size=8).digest(), 'little')
+
+
+class PersistentHashTable(MutableMapping):
+    def __init__(self, path, mode='r'):
+        if mode not in ('r', 'w'):
+            raise ValueError(f"Unsupported mode {mode!r}, expected 'r' or 'w'")
+        self.path = path
+        self.mode = mode
+        # Uncommitted changes of a writable table, a _DELETED value marks a removed key
+        self._changes = {}
+        self._file = None
+        self._mm = None
+        if not os.path.exists(path):
+            if mode == 'r':
+                raise FileNotFoundError(path)
+            self.build(path, ())
+        self._map()
+
+    @classmethod
+    def build(cls, path, items, load_factor=0.5):
+        """Write a new table file from (key, value) pairs, atomically replacing path"""
+        records = []
+        # Like dict(items), a key given more than once keeps its last value
+        for key, value in dict(items).items():
+            key_tag, key_data = _encode(key)
+            value_tag, value_data = _encode(value)
+            records.append((_stable_hash(key_tag, key_data), key_tag, key_data, value_tag, value_data))
+
+        slot_count = 1 << max(3, int(len(records) / load_factor).bit_length())
+        slots = [(0, 0)] * slot_count
+        mask = slot_count - 1
+        data_start = _HEADER.size + slot_count * _SLOT.size
+        chunks = []
+        offset = data_start
+        for hash_, key_tag, key_data, value_tag, value_data in records:
+            index = hash_ & mask
+            while slots[index][1]:
+                index = (index + 1) & mask
+            slots[index] = (hash_, offset)
+            chunks.append(_RECORD.pack(key_tag, len(key_data), value_tag, len(value_data)) + key_data + value_data)
+            offset += _RECORD.size + len(key_data) + len(value_data)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, slot_count, len(records)))
+            f.write(b''.join(_SLOT.pack(*slot) for slot in slots))
+            f.write(b''.join(chunks))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _map(self):
+        self._file = open(self.path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._slot_count, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{self.path} is not a persistent hash table file")
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+            self._mm = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _lookup(self, key_tag, key_data):
+        """Return the mapped (tag, offset, length) of the value stored for the encoded key, or None"""
+        mm = self._mm
+        hash_ = _stable_hash(key_tag, key_data)
+        mask = self._slot_count - 1
+        index = hash_ & mask
+        while True:
+            slot_hash, offset = _SLOT.unpack_from(mm, _HEADER.size + index * _SLOT.size)
+            if not offset:
+                return None
+            if slot_hash == hash_:
+                tag, key_len, value_tag, value_len = _RECORD.unpack_from(mm, offset)
+                start = offset + _RECORD.size
+                if tag == key_tag and key_len == len(key_data) and mm[start:start + key_len] == key_data:
+                    return value_tag, start + key_len, value_len
+            index = (index + 1) & mask
+
+    def _stored_items(self):
+        """All (key, value) pairs of the mapped file, uncommitted changes not included"""
+        mm = self._mm
+        for index in range(self._slot_count):
+            _, offset = _SLOT.unpack_from(mm, _HEADER.size + index * _SLOT.size)
+            if offset:
+                key_tag, key_len, value_tag, value_len = _RECORD.unpack_from(mm, offset)
+                start = offset + _RECORD.size
+                yield (_decode(key_tag, mm[start:start + key_len]),
+                       _decode(value_tag, mm[start + key_len:start + key_len + value_len]))
+
+    def get(self, key, default=None):
+        """Retrieve the value associated with the key"""
+        try:
+            encoded = _encode(key)
+        except TypeError:
+            # A key of an unsupported type can never have been stored
+            return default
+        if key in self._changes:
+            value = self._changes[key]
+            return default if value is _DELETED else value
+        found = self._lookup(*encoded)
+        if found is None:
+            return default
+        tag, start, length = found
+        return _decode(tag, self._mm[start:start + length])
+
+    def set(self, key, value):
+        """Insert or update the key-value pair, visible on disk after commit()"""
+        if self.mode != 'w':
+            raise PermissionError(f"{self.path} is opened read-only")
+        # Validate types now rather than at commit time
+        _encode(key)
+        _encode(value)
+        self._changes[key] = value
+
+    def remove(self, key):
+        """Remove the key and its associated value, visible on disk after commit()"""
+        if self.mode != 'w':
+            raise PermissionError(f"{self.path} is opened read-only")
+        if self.get(key, _MISSING) is _MISSING:
+            raise KeyError(f"Key {key} not found")
+        self._changes[key] = _DELETED
+
+    def commit(self):
+        """Write the table with all pending changes to disk (copy-on-write + atomic rename)"""
+        if not self._changes:
+            return
+        changes = self._changes
+        items = [(k, v) for k, v in self._stored_items() if k not in changes]
+        items.extend((k, v) for k, v in changes.items() if v is not _DELETED)
+        self.build(self.path, items)
+        self.close()
+        self._map()
+        self._changes = {}
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.remove(key)
+
+    def __len__(self):
+        if not self._changes:
+            return self._count
+        return sum(1 for _ in self)
+
+    def __iter__(self):
+        changes = self._changes
+        for k, _ in self._stored_items():
+            if k not in changes:
+                yield k
+        for k, v in list(changes.items()):
+            if v is not _DELETED:
+                yield k
+
+
+def benchmark_cold_open(n=1_000_000, path="benchmark_table.pht"):
+    """Rebuilding a HashTable by replaying set() versus opening a prebuilt PersistentHashTable"""
+    pairs = [(f"key-{i}", i) for i in range(n)]
+    PersistentHashTable.build(path, pairs)
+
+    start = time.perf_counter()
+    rebuilt = HashTable()
+    rebuilt.update(pairs)
+    print(f"HashTable rebuild: {time.perf_counter() - start:.3f}s for {n} keys")
+
+    start = time.perf_counter()
+    with PersistentHashTable(path) as mapped:
+        opened = time.perf_counter() - start
+        value = mapped[f"key-{n // 2}"]
+        first_get = time.perf_counter() - start - opened
+    print(f"PersistentHashTable cold open: {opened * 1e6:.1f} us, first get: {first_get * 1e6:.1f} us ({value})")
+    os.remove(path)
+
+
+"""
+Bounded cache
+
+BoundedHashTable stores its data in a HashTable but never keeps more than `capacity` keys. When a new key does not fit,
+the eviction policy picks the key to drop:
+    LRUPolicy - least recently used key, keys kept in an OrderedDict in access order
+    LFUPolicy - least frequently used key, keys grouped in one OrderedDict per use count (ties go to the older key)
+    TTLPolicy - keys expire `ttl` seconds after they were set, when full the key closest to expiry is dropped
+Updating an existing key counts as a use (LRU, LFU) and restarts its lifetime (TTL). Every policy does O(1) work per
+operation. hits, misses and evictions counters show how well the cache is sized.
+"""
+
+from collections import OrderedDict
+
+
+class LRUPolicy:
+    def __init__(self):
+        self._order = OrderedDict()
+
+    def inserted(self, key):
+        self._order[key] = None
+
+    def accessed(self, key):
+        self._order.move_to_end(key)
+
+    def updated(self, key):
+        self._order.move_to_end(key)
+
+    def removed(self, key):
+        del self._order[key]
+
+    def expired(self, key):
+        return False
+
+    def expired_keys(self):
+        return ()
+
+    def victim(self):
+        return next(iter(self._order))
+
+
+class LFUPolicy:
+    def __init__(self):
+        self._counts = {}
+        # use count -> keys with that count, oldest first
+        self._buckets = {}
+        self._min_count = 0
+
+    def _unlink(self, key):
+        count = self._counts.pop(key)
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        return count
+
+    def _link(self, key, count):
+        self._counts[key] = count
+        self._buckets.setdefault(count, OrderedDict())[key] = None
+
+    def inserted(self, key):
+        self._link(key, 1)
+        self._min_count = 1
+
+    def accessed(self, key):
+        self._link(key, self._unlink(key) + 1)
+
+    def updated(self, key):
+        # A write is a use too, otherwise every update would make a hot key the next victim
+        self.accessed(key)
+
+    def removed(self, key):
+        # _min_count may now point to an emptied bucket. It is fixed lazily in victim(): on the usual evict-then-insert
+        # path inserted() resets it to 1 right away, so no scan over the counts is needed there.
+        self._unlink(key)
+
+    def expired(self, key):
+        return False
+
+    def expired_keys(self):
+        return ()
+
+    def victim(self):
+        if self._min_count not in self._buckets:
+            # Rare path: a remove() took the last key with the lowest count
+            self._min_count = min(self._buckets)
+        return next(iter(self._buckets[self._min_count]))
+
+
+class TTLPolicy:
+    def __init__(self, ttl, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        # Every key gets the same ttl, so insertion order is also expiry order
+        self._expires = OrderedDict()
+
+    def inserted(self, key):
+        self._expires[key] = self.clock() + self.ttl
+
+    def accessed(self, key):
+        pass
+
+    def updated(self, key):
+        # Re-setting a key restarts its lifetime, it moves to the end of the expiry order
+        del self._expires[key]
+        self._expires[key] = self.clock() + self.ttl
+
+    def removed(self, key):
+        del self._expires[key]
+
+    def expired(self, key):
+        return self._expires[key] <= self.clock()
+
+    def expired_keys(self):
+        """Keys whose lifetime is over, only the expired front of the expiry order is visited"""
+        now = self.clock()
+        expired = []
+        for key, expires in self._expires.items():
+            if expires > now:
+                break
+            expired.append(key)
+        return expired
+
+    def victim(self):
+        return next(iter(self._expires))
+
+
+class BoundedHashTable(MutableMapping):
+    def __init__(self, capacity, policy=None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.policy = policy if policy is not None else LRUPolicy()
+        self._table = HashTable()
+        self._table.reserve(capacity)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evict(self, key):
+        self._table.remove(key)
+        self.policy.removed(key)
+        self.evictions += 1
+
+    def set(self, key, value):
+        """Insert or update the key-value pair, evicting a key when the cache is full"""
+        if key in self._table:
+            self._table.set(key, value)
+            self.policy.updated(key)
+            return
+        if len(self._table) >= self.capacity:
+            self._evict(self.policy.victim())
+        self._table.set(key, value)
+        self.policy.inserted(key)
+
+    def get(self, key, default=None):
+        """Retrieve the value associated with the key, counting a hit or a miss"""
+        value = self._table.get(key, _MISSING)
+        if value is not _MISSING and self.policy.expired(key):
+            self._evict(key)
+            value = _MISSING
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.policy.accessed(key)
+        return value
+
+    def remove(self, key):
+        """Remove the key and its associated value"""
+        self._table.remove(key)
+        self.policy.removed(key)
+
+    def _purge_expired(self):
+        """Evict the expired keys, so that len(), iteration and items() agree with get() and `in`"""
+        for key in self.policy.expired_keys():
+            self._evict(key)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.remove(key)
+
+    def __contains__(self, key):
+        # Membership test does not count as a hit or miss and does not refresh the key
+        return key in self._table and not self.policy.expired(key)
+
+    def __len__(self):
+        self._purge_expired()
+        return len(self._table)
+
+    def __iter__(self):
+        self._purge_expired()
+        return iter(list(self._table))
+
+    def __str__(self):
+        self._purge_expired()
+        return str(dict(self._table.items()))
+
+
+# Example Usage:
+cache = BoundedHashTable(capacity=2)
+cache.set("a", 1)
+cache.set("b", 2)
+cache.get("a")  # "a" is now the most recently used key
+cache.set("c", 3)  # evicts "b"
+print(cache, cache.get("b"), cache.stats())
+
+fake_now = [0.0]
+ttl_cache = BoundedHashTable(capacity=10, policy=TTLPolicy(ttl=5, clock=lambda: fake_now[0]))
+ttl_cache.set("session", "abc")
+ttl_cache.set("token", "xyz")
+fake_now[0] = 6.0
+print(ttl_cache.get("session"), dict(ttl_cache), ttl_cache.stats()["evictions"])  # Expected: None {} 2
+
+lfu_cache = BoundedHashTable(capacity=2, policy=LFUPolicy())
+lfu_cache.set("hot", 0)
+for _ in range(100):
+    lfu_cache.get("hot")
+lfu_cache.set("hot", 1)  # an update keeps the use count of "hot"
+lfu_cache.set("cold", 2)
+lfu_cache.set("new", 3)  # evicts "cold"
+print(sorted(lfu_cache))  # Expected: ['hot', 'new']
+
+
+def benchmark_cache_policies(capacity=10_000, ops=500_000):
+    """Throughput and hit rate of each policy on a skewed (80/20) key stream"""
+    rng = random.Random(42)
+    hot = capacity // 2
+    keys = [rng.randrange(hot) if rng.random() < 0.8 else rng.randrange(hot, capacity * 20) for _ in range(ops)]
+    for name, policy in (("LRU", LRUPolicy()), ("LFU", LFUPolicy()), ("TTL", TTLPolicy(ttl=60))):
+        cache = BoundedHashTable(capacity, policy)
+        start = time.perf_counter()
+        for key in keys:
+            if cache.get(key) is None:
+                cache.set(key, key)
+        elapsed = time.perf_counter() - start
+        stats = cache.stats()
+        print(f"{name}: {ops / elapsed / 1e6:.2f} Mops/s, hit rate {stats['hit_rate']:.2%}, "
+              f"{stats['evictions']} evictions")
+
+
+"""
+Hash quality
+
+hash() of an int is the int itself, so with hash(key) % size keys that share a stride with the table size all fall
+into the same few buckets. diagnostics() shows the bucket (or probe) length distribution so skew is visible before it
+turns into latency, and the hash_function argument swaps in a better hash, e.g. seeded_mixer(), without touching
+callers.
+"""
+
+
+def compare_hash_functions(n=10_000, stride=1280):
+    """Diagnostics of strided integer keys with the default hash and with a seeded mixer"""
+    keys = [i * stride for i in range(n)]
+    for name, hash_function in (("hash", hash), ("seeded_mixer", seeded_mixer(seed=1))):
+        for cls in (HashTable, OpenAddressingHashTable):
+            table = cls(hash_function=hash_function)
+            for key in keys:
+                table.set(key, key)
+            report = table.diagnostics()
+            report.pop('histogram')
+            print(f"{cls.__name__:>24} with {name}: {report}")
+
+
+# The benchmarks take minutes and write files, they only run when the module is executed directly
+if __name__ == '__main__':
+    # Example Usage:
+    with PersistentHashTable("example_table.pht", 'w') as pht:
+        pht["name"] = "John"
+        pht[b"raw"] = 42
+        pht.commit()
+    with PersistentHashTable("example_table.pht") as pht:
+        print(pht["name"], pht[b"raw"], len(pht))  # Expected: John 42 2
+    os.remove("example_table.pht")
+
+    # Pass sizes=(10, ..., 10_000_000) to reproduce the 10M keys run
+    benchmark_per_op_latency()
+    benchmark_backends()
+    benchmark_bulk_load()
+    benchmark_concurrent()
+    benchmark_cold_open()
+    benchmark_cache_policies()
+    compare_hash_functions()
@@ -19,6 +19,7 @@ How Iterators Work:
 """
 
 
+import sys
 import time
 from memory_profiler import profile
 
@@ -35,7 +36,8 @@ class LogEntry:
     @classmethod
     def from_line(cls, line):
         parts = line.strip().split()
-        return cls(parts[0], parts[1], parts[2], parts[3])
+        # date and action repeat on almost every line, interning makes all rows share one string object per value
+        return cls(sys.intern(parts[0]), parts[1], parts[2], sys.intern(parts[3]))
 
 
 class LogFileIterator:
@@ -77,3 +79,274 @@ for date, count in result.items():
 end_time = time.time()
 
 print("Time taken:", end_time - start_time, "seconds")
+
+
+"""
+
+Columnar batches
+
+LogFileIterator creates a LogEntry with its own __dict__ for every line, reads the file with one readline() call per
+line and checks hasattr(self, '_file') on every step. For files with millions of lines most of the time goes to
+allocating objects and looking up attributes.
+
+SlottedLogEntry is the same row object with __slots__ (no per-instance __dict__). LogBatchIterator goes further and
+yields LogBatch objects, each holding a few thousand lines as columns:
+    date    - array of ints like 20240105
+    time    - array of seconds since midnight
+    user_id - array of ints
+    action  - array of small category codes, LogBatch.actions maps a code back to its name
+A batch is parsed with one str.split() over all of its lines, and repeated date, time and user_id strings are
+converted to ints only once (memo dicts), so the per-line work is a few dict lookups done inside map(). Newlines are
+kept as fields during the split, so a batch with a line of more or fewer than four fields is noticed and parsed line
+by line instead, skipping the malformed lines. The file is closed when the iterator is exhausted, with close() or at
+the end of a with block.
+
+"""
+
+from array import array
+import tracemalloc
+
+
+class SlottedLogEntry:
+    __slots__ = ('date', 'time', 'user_id', 'action')
+
+    def __init__(self, date, time, user_id, action):
+        self.date = date
+        self.time = time
+        self.user_id = user_id
+        self.action = action
+
+    @classmethod
+    def from_line(cls, line):
+        parts = line.split()
+        return cls(sys.intern(parts[0]), parts[1], parts[2], sys.intern(parts[3]))
+
+
+class _Memo(dict):
+    """dict that computes and stores missing values, so map(memo.__getitem__, ...) parses each distinct value once"""
+
+    def __init__(self, parse):
+        super().__init__()
+        self.parse = parse
+
+    def __missing__(self, key):
+        value = self[key] = self.parse(key)
+        return value
+
+
+# ASCII whitespace other than space and newline, str.split() would split on it too
+_OTHER_WHITESPACE = '\t\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
+
+def _batch_fields(lines):
+    """Flat list of the four fields of every line, malformed lines are skipped"""
+    text = ''.join(lines)
+    if not text.endswith('\n'):
+        text += '\n'
+    if text.isascii() and not any(char in text for char in _OTHER_WHITESPACE):
+        # Every newline becomes a field of its own. Every fifth field must be a newline and no field may be empty
+        # (two spaces in a row), otherwise the strided column slices of LogBatchIterator would mix up the fields of
+        # neighbouring lines.
+        text = text.replace('\n', ' \n ')
+        if '  ' not in text and not text.startswith(' '):
+            fields = text.split(' ')
+            fields.pop()
+            if len(fields) == 5 * len(lines) and fields[4::5].count('\n') == len(lines):
+                del fields[4::5]
+                return fields
+    fields = []
+    for line in lines:
+        parts = line.split()
+        if len(parts) == 4:
+            fields.extend(parts)
+    return fields
+
+
+def _parse_date(date):
+    return int(date[:4]) * 10000 + int(date[5:7]) * 100 + int(date[8:10])
+
+
+def _parse_time(time_):
+    return int(time_[:2]) * 3600 + int(time_[3:5]) * 60 + int(time_[6:8])
+
+
+class Dictionary(dict):
+    """Value -> small integer code, codes are handed out in order of first appearance; values[code] decodes"""
+
+    def __init__(self, values=()):
+        super().__init__()
+        self.values = []
+        for value in values:
+            self[value]
+
+    def __missing__(self, value):
+        code = self[value] = len(self.values)
+        self.values.append(value)
+        return code
+
+    def encode(self, values, typecode='l'):
+        return array(typecode, map(self.__getitem__, values))
+
+
+class LogBatch:
+    __slots__ = ('date', 'time', 'user_id', 'action', 'actions', 'date_code', 'dates')
+
+    def __init__(self, date, time, user_id, action, actions, date_code=None, dates=None):
+        self.date = date
+        self.time = time
+        self.user_id = user_id
+        self.action = action
+        self.actions = actions
+        self.date_code = date_code
+        self.dates = dates
+
+    def __len__(self):
+        for column in (self.date, self.time, self.user_id, self.action, self.date_code):
+            if column is not None:
+                return len(column)
+        return 0
+
+    def action_code(self, name):
+        """Category code of an action name, -1 if it does not occur"""
+        return self.actions.index(name) if name in self.actions else -1
+
+
+class LogBatchIterator:
+    COLUMNS = ('date', 'time', 'user_id', 'action', 'date_code')
+
+    def __init__(self, filename, batch_bytes=1 << 20, action_dictionary=None, date_dictionary=None, columns=None):
+        self.filename = filename
+        # Columns that are not requested are left as None in the batches and never parsed
+        self.columns = frozenset(columns or self.COLUMNS)
+        self.batch_bytes = batch_bytes
+        self._file = None
+        self._dates = _Memo(_parse_date)
+        self._times = _Memo(_parse_time)
+        self._user_ids = _Memo(int)
+        # Shared by all batches, and by several iterators when passed in
+        self.action_dictionary = action_dictionary if action_dictionary is not None else Dictionary()
+        self.date_dictionary = date_dictionary if date_dictionary is not None else Dictionary()
+
+    def __iter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the file, a partly consumed iterator does not keep it open. Later next() calls stop at once"""
+        if self._file:
+            self._file.close()
+        # False (not None) marks a finished iterator, it is never reopened
+        self._file = False
+
+    def __next__(self):
+        if self._file is None:
+            self._file = open(self.filename, 'r')
+        elif self._file is False:
+            raise StopIteration
+        lines = self._file.readlines(self.batch_bytes)
+        if not lines:
+            self.close()
+            raise StopIteration
+
+        fields = _batch_fields(lines)
+        columns = self.columns
+        return LogBatch(
+            array('l', map(self._dates.__getitem__, fields[0::4])) if 'date' in columns else None,
+            array('l', map(self._times.__getitem__, fields[1::4])) if 'time' in columns else None,
+            array('l', map(self._user_ids.__getitem__, fields[2::4])) if 'user_id' in columns else None,
+            self.action_dictionary.encode(fields[3::4], 'b') if 'action' in columns else None,
+            self.action_dictionary.values,
+            self.date_dictionary.encode(fields[0::4]) if 'date_code' in columns else None,
+            self.date_dictionary.values,
+        )
+
+
+def count_login_per_day_with_batches(filename):
+    login_counts = {}
+    for batch in LogBatchIterator(filename, columns=('date', 'action')):
+        login = batch.action_code("LOGIN")
+        for date, action in zip(batch.date, batch.action):
+            if action == login:
+                login_counts[date] = login_counts.get(date, 0) + 1
+    return {f"{date // 10000:04d}-{date // 100 % 100:02d}-{date % 100:02d}": count
+            for date, count in login_counts.items()}
+
+
+def _slotted_rows(filename):
+    with open(filename) as f:
+        return [SlottedLogEntry.from_line(line) for line in f]
+
+
+def benchmark_log_iterators(filename=log_file):
+    readers = (
+        ("LogFileIterator", lambda: list(LogFileIterator(filename))),
+        ("SlottedLogEntry rows", lambda: _slotted_rows(filename)),
+        ("LogBatchIterator", lambda: list(LogBatchIterator(filename))),
+    )
+    for name, read_all in readers:
+        tracemalloc.start()
+        data = read_all()
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del data
+        # Timed separately, tracemalloc slows down every allocation
+        start = time.perf_counter()
+        read_all()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>22}: {memory / 1024 ** 2:.1f} MiB held, {elapsed:.2f}s")
+
+    assert count_login_per_day_with_batches(filename) == count_login_per_day_with_iterator(filename)
+    print("count_login_per_day_with_batches matches count_login_per_day_with_iterator")
+
+
+"""
+
+Dictionary encoding
+
+The action column has four values and the date column a handful, yet every row used to carry its own string.
+LogEntry.from_line now interns them (one shared str per distinct value), and LogBatchIterator dictionary-encodes both
+columns: a Dictionary maps every distinct value to a small integer code and keeps the values list to decode them.
+The dictionaries can be passed in, so several files (or several runs) use the same codes.
+
+With codes the login count needs no string work at all: one integer comparison per row selects the LOGIN rows and
+numpy.bincount adds up the date codes of those rows. Passing columns= to LogBatchIterator skips parsing the columns a
+query does not use.
+
+"""
+
+import numpy as np
+
+
+def count_login_per_day_encoded(filename, date_dictionary=None):
+    batches = LogBatchIterator(filename, date_dictionary=date_dictionary, columns=('action', 'date_code'))
+    login = batches.action_dictionary["LOGIN"]
+    totals = np.zeros(0, dtype=np.int64)
+    for batch in batches:
+        date_codes = np.asarray(batch.date_code)
+        counts = np.bincount(date_codes[np.asarray(batch.action) == login], minlength=len(batch.dates))
+        # New dates may have appeared in this batch, grow the totals to the dictionary size
+        totals = np.pad(totals, (0, len(counts) - len(totals)))
+        totals += counts
+    dates = batches.date_dictionary.values
+    return {dates[code]: int(count) for code, count in enumerate(totals) if count}
+
+
+def benchmark_encoded_count(filename=log_file):
+    for name, count in (("count_login_per_day_with_iterator", count_login_per_day_with_iterator),
+                        ("count_login_per_day_with_batches", count_login_per_day_with_batches),
+                        ("count_login_per_day_encoded", count_login_per_day_encoded)):
+        start = time.perf_counter()
+        result = count(filename)
+        print(f"{name:>34}: {time.perf_counter() - start:.2f}s")
+    assert result == count_login_per_day_with_iterator(filename)
+
+
+# The benchmarks read the whole log several times, they only run when the module is executed directly
+if __name__ == '__main__':
+    benchmark_log_iterators()
+    benchmark_encoded_count()
@@ -0,0 +1,76 @@
+"""
+
+Parallel log scanning
+
+generators.count_login_per_day and iterators.count_login_per_day_with_iterator parse one line after another in a
+single process, so only one CPU core does the work. Counting logins is easy to split:
+
+1. The file is cut into byte ranges and every range end is moved to the next newline (external_sort.chunk_boundaries),
+   so each line belongs to exactly one range.
+2. A process pool scans the ranges in parallel. Every worker reads its range as bytes and builds its own partial
+   login_counts dict.
+3. The partial dicts are added together in the parent.
+
+There is no shared state between workers, so the speedup is close to linear in the number of cores as long as the disk
+keeps up. The module has no example code at import time because worker processes may import it again (spawn start
+method on Windows and macOS).
+
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from external_sort import chunk_boundaries
+
+
+def _count_logins_in_range(filename, start, end):
+    """Worker: login_counts of the lines in filename[start:end]"""
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    login_counts = {}
+    for line in data.splitlines():
+        parts = line.split()
+        # date, time, user_id, action
+        if len(parts) >= 4 and parts[3] == b'LOGIN':
+            date = parts[0]
+            login_counts[date] = login_counts.get(date, 0) + 1
+    return login_counts
+
+
+def count_login_per_day_parallel(filename, workers=None, chunk_bytes=None):
+    workers = workers or os.cpu_count() or 1
+    if chunk_bytes is None:
+        # A few chunks per worker keeps all cores busy even if some chunks are slower
+        chunk_bytes = max(1024 ** 2, os.path.getsize(filename) // (workers * 4))
+    ranges = list(chunk_boundaries(filename, chunk_bytes))
+
+    login_counts = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = pool.map(_count_logins_in_range, [filename] * len(ranges), *zip(*ranges))
+        for partial in partials:
+            for date, count in partial.items():
+                login_counts[date] = login_counts.get(date, 0) + count
+    return {date.decode(): count for date, count in sorted(login_counts.items())}
+
+
+def benchmark_parallel_scan(filename="./large_log_file.log", worker_counts=(1, 2, 4, 8)):
+    # Use the 1M+ line file written by log_file.generate_log_file
+    start = time.perf_counter()
+    expected = _count_logins_in_range(filename, 0, os.path.getsize(filename))
+    single = time.perf_counter() - start
+    print(f"single process: {single:.2f}s")
+
+    for workers in worker_counts:
+        start = time.perf_counter()
+        result = count_login_per_day_parallel(filename, workers=workers)
+        elapsed = time.perf_counter() - start
+        assert result == {date.decode(): count for date, count in sorted(expected.items())}
+        print(f"{workers} workers: {elapsed:.2f}s, speedup {single / elapsed:.1f}x")
+
+
+if __name__ == '__main__':
+    for date, count in count_login_per_day_parallel("./large_log_file.log").items():
+        print(f"On {date}, there were {count} logins.")
+    benchmark_parallel_scan()
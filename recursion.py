@@ -56,3 +56,631 @@ r = insert(r, 80)
 
 # Print in order traversal of the BST
 inorder(r)
+
+
+"""
+
+Lazy traversals without recursion
+
+inorder() above recurses (so it fails on trees deeper than the recursion limit) and prints instead of returning values.
+The generators below walk the tree with an explicit stack or queue and yield keys one at a time, so the caller can
+stop early (break, itertools.islice) and nothing is printed.
+
+iter_inorder(root, start_from=key) starts at the first key >= start_from. Only the nodes on the path to that key are
+visited to get there, which makes it a cheap way to resume a range scan where the previous one stopped.
+morris_inorder() needs no stack at all: it temporarily links the rightmost node of each left subtree back to its
+parent (threading) and removes the links on the way back, so the tree is restored even if iteration stops early.
+
+"""
+
+from collections import deque
+
+
+def _inorder_nodes(root, start_from=None):
+    stack = []
+    node = root
+    while stack or node:
+        # Skip left subtrees whose keys are all below start_from
+        while node:
+            if start_from is not None and node.val < start_from:
+                node = node.right
+            else:
+                stack.append(node)
+                node = node.left
+        if not stack:
+            return
+        node = stack.pop()
+        yield node
+        node = node.right
+
+
+def iter_inorder(root, start_from=None):
+    for node in _inorder_nodes(root, start_from):
+        yield node.val
+
+
+def iter_preorder(root):
+    stack = [root] if root else []
+    while stack:
+        node = stack.pop()
+        yield node.val
+        if node.right:
+            stack.append(node.right)
+        if node.left:
+            stack.append(node.left)
+
+
+def iter_postorder(root):
+    stack = []
+    last = None
+    node = root
+    while stack or node:
+        if node:
+            stack.append(node)
+            node = node.left
+            continue
+        top = stack[-1]
+        if top.right and top.right is not last:
+            node = top.right
+        else:
+            yield top.val
+            last = stack.pop()
+
+
+def iter_levelorder(root):
+    queue = deque([root] if root else [])
+    while queue:
+        node = queue.popleft()
+        yield node.val
+        if node.left:
+            queue.append(node.left)
+        if node.right:
+            queue.append(node.right)
+
+
+def morris_inorder(root):
+    node = root
+    try:
+        while node:
+            if node.left is None:
+                yield node.val
+                node = node.right
+                continue
+            predecessor = node.left
+            while predecessor.right and predecessor.right is not node:
+                predecessor = predecessor.right
+            if predecessor.right is None:
+                # Thread: come back to node after its left subtree is done
+                predecessor.right = node
+                node = node.left
+            else:
+                predecessor.right = None
+                yield node.val
+                node = node.right
+    finally:
+        # Stopped early: finish the walk silently to remove the remaining threads
+        while node:
+            if node.left is None:
+                node = node.right
+                continue
+            predecessor = node.left
+            while predecessor.right and predecessor.right is not node:
+                predecessor = predecessor.right
+            if predecessor.right is None:
+                predecessor.right = node
+                node = node.left
+            else:
+                predecessor.right = None
+                node = node.right
+
+
+print()
+print(list(iter_preorder(r)), list(iter_postorder(r)), list(iter_levelorder(r)))
+print(list(iter_inorder(r, start_from=45)), list(morris_inorder(r)))
+# Expected: [50, 30, 20, 40, 70, 60, 80] [20, 40, 30, 60, 80, 70, 50] [50, 30, 70, 20, 40, 60, 80]
+#           [50, 60, 70, 80] [20, 30, 40, 50, 60, 70, 80]
+
+# A degenerate tree 100000 levels deep, far beyond the recursion limit
+deep = Node(0)
+tail = deep
+for key in range(1, 100_000):
+    tail.right = Node(key)
+    tail = tail.right
+print(sum(1 for _ in iter_inorder(deep)), next(iter_inorder(deep, start_from=99_990)))  # Expected: 100000 99990
+
+
+"""
+
+Balanced BST (AVL tree)
+
+insert() above never rebalances: with sorted keys every new key becomes the right child of the previous one, the tree
+degrades into a linked list, inserts cost O(n) and the recursion goes n levels deep.
+
+AVLTree keeps the Node idea (val, left, right) but every node also stores the height of its subtree. After an insert
+or delete the heights on the path back to the root are updated and any node whose subtrees differ in height by more
+than one is fixed with one or two rotations, so the height stays below 1.44 * log2(n). All operations walk the tree
+with loops and an explicit path list instead of recursion.
+
+"""
+
+import time
+
+
+class AVLNode(Node):
+    def __init__(self, key, value=None):
+        super().__init__(key)
+        self.value = value
+        self.height = 1
+
+
+def _height(node):
+    return node.height if node else 0
+
+
+def _update_height(node):
+    node.height = 1 + max(_height(node.left), _height(node.right))
+
+
+def _rotate_right(node):
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+
+def _rotate_left(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+
+def _rebalance(node):
+    """Restore the AVL property at node and return the new root of its subtree"""
+    _update_height(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
+
+
+class AVLTree:
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _fix_path(self, path):
+        """Rebalance every node on the path from the changed node back up to the root"""
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            subtree = _rebalance(node)
+            if subtree is node and node.height == old_height:
+                # Nothing changed at this level, so nothing above it changes either
+                return
+            if i == 0:
+                self.root = subtree
+            elif path[i - 1].left is node:
+                path[i - 1].left = subtree
+            else:
+                path[i - 1].right = subtree
+
+    def insert(self, key, value=None):
+        """Insert the key, or update its value if it is already in the tree"""
+        path = []
+        node = self.root
+        while node:
+            if key == node.val:
+                node.value = value
+                return
+            path.append(node)
+            node = node.left if key < node.val else node.right
+
+        new = AVLNode(key, value)
+        self.size += 1
+        if not path:
+            self.root = new
+            return
+        parent = path[-1]
+        if key < parent.val:
+            parent.left = new
+        else:
+            parent.right = new
+        self._fix_path(path)
+
+    def delete(self, key):
+        """Remove the key, raises KeyError if it is not in the tree"""
+        path = []
+        node = self.root
+        while node and node.val != key:
+            path.append(node)
+            node = node.left if key < node.val else node.right
+        if node is None:
+            raise KeyError(key)
+
+        if node.left and node.right:
+            # Replace the key with its in-order successor and remove the successor node instead
+            path.append(node)
+            successor = node.right
+            while successor.left:
+                path.append(successor)
+                successor = successor.left
+            node.val, node.value = successor.val, successor.value
+            node = successor
+
+        child = node.left or node.right
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self.size -= 1
+        self._fix_path(path)
+
+    def search(self, key, default=None):
+        """Value stored for the key"""
+        node = self.root
+        while node:
+            if key == node.val:
+                return node.value
+            node = node.left if key < node.val else node.right
+        return default
+
+    def __contains__(self, key):
+        node = self.root
+        while node:
+            if key == node.val:
+                return True
+            node = node.left if key < node.val else node.right
+        return False
+
+    def floor(self, key):
+        """Largest key <= key, None if there is none"""
+        node, best = self.root, None
+        while node:
+            if node.val == key:
+                return key
+            if node.val < key:
+                best = node.val
+                node = node.right
+            else:
+                node = node.left
+        return best
+
+    def ceiling(self, key):
+        """Smallest key >= key, None if there is none"""
+        node, best = self.root, None
+        while node:
+            if node.val == key:
+                return key
+            if node.val > key:
+                best = node.val
+                node = node.left
+            else:
+                node = node.right
+        return best
+
+    def range(self, low=None, high=None):
+        """(key, value) pairs with low <= key <= high in ascending order"""
+        for node in _inorder_nodes(self.root, start_from=low):
+            if high is not None and node.val > high:
+                return
+            yield node.val, node.value
+
+    def __iter__(self):
+        for key, _ in self.range():
+            yield key
+
+
+tree = AVLTree()
+for key in [50, 30, 20, 40, 70, 60, 80]:
+    tree.insert(key)
+tree.delete(30)
+print(list(tree), tree.floor(55), tree.ceiling(55), list(tree.range(40, 70)))
+# Expected: [20, 40, 50, 60, 70, 80] 50 60 [(40, None), (50, None), (60, None), (70, None)]
+
+
+def benchmark_sorted_inserts(n=1_000_000):
+    """Sorted keys (timestamps) make insert() build a linked list, AVLTree stays log2(n) deep"""
+    start = time.perf_counter()
+    tree = AVLTree()
+    for key in range(n):
+        tree.insert(key)
+    print(f"AVLTree: {n} sorted inserts in {time.perf_counter() - start:.2f}s, height {tree.root.height}")
+
+    root = None
+    try:
+        for key in range(n):
+            root = insert(root, key)
+    except RecursionError:
+        print(f"insert: RecursionError after {key} sorted keys")
+
+
+"""
+
+Array-backed BST
+
+Every Node is a Python object with its own __dict__, about 100 bytes per node plus a separate int object for the key.
+ArrayBST stores the same tree in three parallel typed arrays: keys[i], left[i] and right[i] describe node i, child
+links are indexes into the arrays and -1 means "no child". An integer key then costs 24 bytes (three 8-byte slots)
+and no Python object at all.
+
+from_sorted() builds a perfectly balanced tree from sorted keys in O(n): the keys are copied as they are and only the
+child indexes are filled in, taking the middle of each range as the subtree root.
+
+"""
+
+from array import array
+import random
+import tracemalloc
+
+
+class ArrayBST:
+    def __init__(self):
+        self.keys = array('q')
+        self.left = array('q')
+        self.right = array('q')
+        self.root = -1
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _new_node(self, key):
+        self.keys.append(key)
+        self.left.append(-1)
+        self.right.append(-1)
+        return len(self.keys) - 1
+
+    def insert(self, key):
+        """Insert the key like insert() does: smaller keys go left, the rest right, no rebalancing"""
+        if self.root < 0:
+            self.root = self._new_node(key)
+            return
+        keys, left, right = self.keys, self.left, self.right
+        node = self.root
+        while True:
+            if key < keys[node]:
+                if left[node] < 0:
+                    left[node] = self._new_node(key)
+                    return
+                node = left[node]
+            else:
+                if right[node] < 0:
+                    right[node] = self._new_node(key)
+                    return
+                node = right[node]
+
+    def search(self, key):
+        """True if the key is in the tree"""
+        keys, left, right = self.keys, self.left, self.right
+        node = self.root
+        while node >= 0:
+            if key == keys[node]:
+                return True
+            node = left[node] if key < keys[node] else right[node]
+        return False
+
+    def inorder(self):
+        """Keys in ascending order"""
+        keys, left, right = self.keys, self.left, self.right
+        stack = []
+        node = self.root
+        while stack or node >= 0:
+            while node >= 0:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            yield keys[node]
+            node = right[node]
+
+    @classmethod
+    def from_sorted(cls, sorted_keys):
+        """Balanced tree from keys in ascending order in O(n), node i holds the i-th smallest key"""
+        tree = cls()
+        tree.keys = array('q', sorted_keys)
+        n = len(tree.keys)
+        tree.left = array('q', [-1]) * n
+        tree.right = array('q', [-1]) * n
+        if not n:
+            return tree
+        tree.root = (n - 1) // 2
+        # (lo, hi) ranges whose middle is the root of a subtree still to be linked
+        stack = [(0, n - 1)]
+        left, right = tree.left, tree.right
+        while stack:
+            lo, hi = stack.pop()
+            mid = (lo + hi) // 2
+            if lo < mid:
+                left[mid] = (lo + mid - 1) // 2
+                stack.append((lo, mid - 1))
+            if mid < hi:
+                right[mid] = (mid + 1 + hi) // 2
+                stack.append((mid + 1, hi))
+        return tree
+
+
+compact = ArrayBST()
+for key in [50, 30, 20, 40, 70, 60, 80]:
+    compact.insert(key)
+print(list(compact.inorder()), compact.search(60), compact.search(65))  # Expected: [20, ..., 80] True False
+print(list(ArrayBST.from_sorted(range(10)).inorder()))
+
+
+def benchmark_compact_tree(n=200_000):
+    """Bytes per key of a Node tree and an ArrayBST holding the same random integer keys"""
+    keys = random.sample(range(n * 100), n)
+    for name, build in (("Node", lambda: _node_tree(keys)), ("ArrayBST", lambda: _array_tree(keys))):
+        tracemalloc.start()
+        tree = build()
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del tree
+        # Timed separately, tracemalloc slows down every allocation
+        start = time.perf_counter()
+        build()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8}: {memory / n:.1f} bytes/key, built in {elapsed:.2f}s")
+
+    start = time.perf_counter()
+    ArrayBST.from_sorted(range(n * 5))
+    print(f"ArrayBST.from_sorted: {n * 5} keys in {time.perf_counter() - start:.2f}s")
+
+
+def _node_tree(keys):
+    # Iterative version of insert() so random keys of any count can be loaded
+    root = None
+    for key in keys:
+        new = Node(key)
+        if root is None:
+            root = new
+            continue
+        node = root
+        while True:
+            if key < node.val:
+                if node.left is None:
+                    node.left = new
+                    break
+                node = node.left
+            else:
+                if node.right is None:
+                    node.right = new
+                    break
+                node = node.right
+    return root
+
+
+def _array_tree(keys):
+    tree = ArrayBST()
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+
+"""
+
+Bulk loading, merging and splitting AVL trees
+
+Inserting n keys one by one costs O(n log n) rotations and comparisons. When the keys are already sorted the balanced
+tree can be built directly: the middle key becomes the root, the middles of both halves its children and so on, and
+the height of every node follows from the size of its range. from_sorted() does this in O(n) without recursion.
+
+merge() and split() reuse it: both trees are read in order (already sorted), combined or cut with a linear pass and the
+result is bulk-loaded into a new tree, so index compaction never pays per-key insert cost.
+
+"""
+
+
+def _build_balanced(pairs):
+    """AVLTree from a list of (key, value) pairs with strictly ascending keys"""
+    tree = AVLTree()
+    n = len(pairs)
+    tree.size = n
+    if not n:
+        return tree
+    nodes = [AVLNode(key, value) for key, value in pairs]
+    tree.root = nodes[(n - 1) // 2]
+    stack = [(0, n - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        # A range of size s gives a balanced subtree of height s.bit_length()
+        node.height = (hi - lo + 1).bit_length()
+        if lo < mid:
+            node.left = nodes[(lo + mid - 1) // 2]
+            stack.append((lo, mid - 1))
+        if mid < hi:
+            node.right = nodes[(mid + 1 + hi) // 2]
+            stack.append((mid + 1, hi))
+    return tree
+
+
+def from_sorted(iterable, values=None):
+    """Balanced AVLTree from keys in strictly ascending order in O(n), values (if given) are matched by position"""
+    keys = list(iterable)
+    values = [None] * len(keys) if values is None else list(values)
+    if len(values) != len(keys):
+        raise ValueError("keys and values must have the same length")
+    for previous, key in zip(keys, keys[1:]):
+        if not previous < key:
+            raise ValueError(f"Keys are not strictly ascending: {previous!r} before {key!r}")
+    return _build_balanced(list(zip(keys, values)))
+
+
+def merge(tree_a, tree_b):
+    """New AVLTree with the keys of both trees in O(n + m), tree_b's value wins for keys present in both"""
+    a, b = list(tree_a.range()), list(tree_b.range())
+    merged = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i][0] < b[j][0]:
+            merged.append(a[i])
+            i += 1
+        elif b[j][0] < a[i][0]:
+            merged.append(b[j])
+            j += 1
+        else:
+            merged.append(b[j])
+            i += 1
+            j += 1
+    merged.extend(a[i:])
+    merged.extend(b[j:])
+    return _build_balanced(merged)
+
+
+def split(tree, key):
+    """Two new AVLTrees in O(n): keys < key and keys >= key"""
+    pairs = list(tree.range())
+    lo, hi = 0, len(pairs)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if pairs[mid][0] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return _build_balanced(pairs[:lo]), _build_balanced(pairs[lo:])
+
+
+left_tree, right_tree = split(from_sorted([10, 20, 30, 40, 50]), 30)
+print(list(left_tree), list(right_tree), list(merge(left_tree, from_sorted([15, 35]))))
+# Expected: [10, 20] [30, 40, 50] [10, 15, 20, 35]
+
+
+def benchmark_bulk_load(n=1_000_000):
+    keys = range(0, n * 2, 2)
+    start = time.perf_counter()
+    tree = AVLTree()
+    for key in keys:
+        tree.insert(key)
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = from_sorted(keys)
+    bulk_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    merged = merge(bulk, from_sorted(range(1, n * 2, 2)))
+    merge_time = time.perf_counter() - start
+    print(f"{n} keys: insert loop {insert_time:.2f}s, from_sorted {bulk_time:.2f}s (height {bulk.root.height}), "
+          f"merge to {len(merged)} keys {merge_time:.2f}s")
+
+
+# The benchmarks take minutes, they only run when the module is executed directly
+if __name__ == '__main__':
+    benchmark_sorted_inserts()
+    benchmark_compact_tree()
+    benchmark_bulk_load()